@@ -367,7 +367,7 @@ Key guidelines:
             return False
         
         try:
-            ai_config = self.config_manager.get_ai_config()
+            ai_config = dict(self.config_manager.get_ai_config())
             ai_config['provider'] = provider_name  # Update provider in config
             provider_class = self.providers[provider_name]
             new_provider = provider_class(ai_config)
@@ -375,8 +375,7 @@ Key guidelines:
             if new_provider.is_available():
                 self.current_provider = new_provider
                 # Update main config
-                self.config_manager.config['ai']['provider'] = provider_name
-                self.config_manager.save_config()
+                self.config_manager.set_ai_provider(provider_name)
                 self.logger.info(f"Switched to provider: {provider_name}")
                 return True
             else:
@@ -1,27 +1,179 @@
+import asyncio
+import atexit
+import bisect
+import collections
 import os
 import openai
 from datetime import datetime, timedelta
+import hashlib
 import json
+import mmap
+import re
+import shutil
+import struct
 import sys
+import time
+import weakref
 
 # Add src directory to Python path for logger import
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 from utils.logger import setup_logging
 
+SEMANTIC_CACHE_THRESHOLD_KEY = "semantic_cache_threshold"
+RESPONSE_CACHE_TTL_KEY = "response_cache_ttl"
+MAX_TURNS_KEY = "max_turns"
+DEFAULT_MAX_TURNS = 20
+# messages.idx record: entry epoch seconds, byte offset of the entry in the log
+_INDEX_ENTRY = struct.Struct("<qQ")
+_LOG_BUFFER_SIZE = 256 * 1024
+_LOG_HEADER_RE = re.compile(rb"^\[(\d{4}-\d{2}-\d{2}), ", re.MULTILINE)
+# Near-duplicate prompt signatures: character shingle size and MinHash permutations
+_SHINGLE_SIZE = 5
+_MINHASH_PERMUTATIONS = 64
+# Sentence terminator followed by whitespace; a terminator at the end of a chunk waits for more text
+_SENTENCE_END_RE = re.compile(r"[.!?]+[\"')\]]*\s+")
+# Options handled here rather than sent to the API
+_LOCAL_OPTIONS = (SEMANTIC_CACHE_THRESHOLD_KEY, RESPONSE_CACHE_TTL_KEY, MAX_TURNS_KEY)
+
+
+# Instances with open log handles; flushed by a single exit hook without keeping them alive
+_open_chats = weakref.WeakSet()
+
+
+def _close_all_log_files():
+    for chat in list(_open_chats):
+        chat._close_log_files()
+
+
+atexit.register(_close_all_log_files)
+
+
+def iter_sentences(chunks):
+    # Regroups streamed text into whole sentences, e.g. to start speaking before the reply is complete
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+        for match in _SENTENCE_END_RE.finditer(buffer):
+            sentence = buffer[start:match.end()].strip()
+            if sentence:
+                yield sentence
+            start = match.end()
+        buffer = buffer[start:]
+    if buffer.strip():
+        yield buffer.strip()
+
+
+class _SemanticCache:
+    # Replies keyed by normalized prompt embeddings; inner product == cosine similarity
+    def __init__(self, threshold, max_entries=1000, model_name="all-MiniLM-L6-v2", near_duplicate_threshold=0.9):
+        import faiss
+        from sentence_transformers import SentenceTransformer
+
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._model = SentenceTransformer(model_name)
+        self._index = faiss.IndexFlatIP(self._model.get_sentence_embedding_dimension())
+        self._replies = []
+
+        # Typo-level edits are caught by MinHash LSH before paying for an embedding
+        try:
+            from datasketch import MinHashLSH
+            self._lsh = MinHashLSH(threshold=near_duplicate_threshold, num_perm=_MINHASH_PERMUTATIONS)
+        except ImportError:
+            self._lsh = None
+        self._near_duplicate_threshold = near_duplicate_threshold
+        self._lsh_keys = []
+        self._lsh_replies = {}
+        self._next_key = 0
+
+    def clear(self):
+        # Drops every cached reply but keeps the loaded embedding model
+        self._index.reset()
+        self._replies = []
+        if self._lsh is not None:
+            from datasketch import MinHashLSH
+            self._lsh = MinHashLSH(threshold=self._near_duplicate_threshold, num_perm=_MINHASH_PERMUTATIONS)
+        self._lsh_keys = []
+        self._lsh_replies = {}
+
+    def embed(self, text):
+        return self._model.encode([text], normalize_embeddings=True)
+
+    def signature(self, text):
+        if self._lsh is None:
+            return None
+        from datasketch import MinHash
+
+        text = " ".join(text.lower().split())
+        shingles = {text[i:i + _SHINGLE_SIZE] for i in range(max(1, len(text) - _SHINGLE_SIZE + 1))}
+        minhash = MinHash(num_perm=_MINHASH_PERMUTATIONS)
+        minhash.update_batch([shingle.encode("utf-8") for shingle in shingles])
+        return minhash
+
+    def lookup_near_duplicate(self, signature):
+        if signature is None:
+            return None
+        for key in self._lsh.query(signature):
+            return self._lsh_replies[key]
+        return None
+
+    def lookup(self, embedding):
+        if self._index.ntotal == 0:
+            return None
+        scores, ids = self._index.search(embedding, 1)
+        if scores[0, 0] >= self.threshold:
+            return self._replies[ids[0, 0]]
+        return None
+
+    def add(self, embedding, reply, signature=None):
+        if len(self._replies) >= self.max_entries:
+            # Flat index ids shift down on removal, matching the replies list
+            import numpy as np
+            self._index.remove_ids(np.array([0], dtype=np.int64))
+            self._replies.pop(0)
+        self._index.add(embedding)
+        self._replies.append(reply)
+
+        if signature is not None:
+            if len(self._lsh_keys) >= self.max_entries:
+                key = self._lsh_keys.pop(0)
+                self._lsh.remove(key)
+                del self._lsh_replies[key]
+            key = str(self._next_key)
+            self._next_key += 1
+            self._lsh.insert(key, signature)
+            self._lsh_keys.append(key)
+            self._lsh_replies[key] = reply
+
+
 class ChatGPT:
     def __init__(self):
-        self.messages = []
+        # Sliding window of the last max_turns exchanges, so prompt size stays bounded
+        self.messages = collections.deque(maxlen=2 * DEFAULT_MAX_TURNS)
         self.model_name = "gpt-3.5-turbo"
         self.api_token = None
         self.customizations = {}
         self.log_path = "./messages.msg"
+        self.index_path = os.path.splitext(self.log_path)[0] + ".idx"
         self.client = None
+        self.semantic_cache_threshold = None
+        self._semantic_cache = None
+        self.cache_ttl = None
+        self.cache_path = os.path.join(os.path.dirname(self.log_path), "response_cache.json")
+        self._exact_cache = None
         self.logger = setup_logging("home_assistant.chatgpt")
         os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
-        if not os.path.exists(self.log_path):
-            open(self.log_path, 'w').close()
+        # Log appends go through long-lived buffered handles, flushed on clear and at exit
+        self._log_fh = None
+        self._index_fh = None
+        self._open_log_files()
+        _open_chats.add(self)
 
     def model(self, model_name):
+        if model_name != self.model_name and self._semantic_cache is not None:
+            # Cached replies were written by the previous model
+            self._semantic_cache.clear()
         self.model_name = model_name
 
     def token(self, token):
@@ -29,7 +181,70 @@ class ChatGPT:
         self.client = openai.OpenAI(api_key=token)
 
     def customiseResponse(self, customizations):
-        self.customizations = customizations
+        max_turns = customizations.get(MAX_TURNS_KEY, DEFAULT_MAX_TURNS)
+        if isinstance(max_turns, bool) or not isinstance(max_turns, int) or max_turns < 1:
+            raise ValueError(f"{MAX_TURNS_KEY} must be a positive integer, got {max_turns!r}")
+        # Cache settings are ours, everything else goes to the API as-is
+        api_options = {k: v for k, v in customizations.items() if k not in _LOCAL_OPTIONS}
+        if api_options != self.customizations and self._semantic_cache is not None:
+            self._semantic_cache.clear()
+        self.customizations = api_options
+        self.cache_ttl = customizations.get(RESPONSE_CACHE_TTL_KEY)
+        max_messages = 2 * max_turns
+        if max_messages != self.messages.maxlen:
+            self.messages = collections.deque(self.messages, maxlen=max_messages)
+        threshold = customizations.get(SEMANTIC_CACHE_THRESHOLD_KEY)
+        if threshold != self.semantic_cache_threshold:
+            self.semantic_cache_threshold = threshold
+            self._semantic_cache = None
+
+    def _load_exact_cache(self):
+        if self._exact_cache is None:
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    self._exact_cache = json.load(f)
+            except (OSError, ValueError):
+                self._exact_cache = {}
+        return self._exact_cache
+
+    def _exact_cache_key(self):
+        payload = json.dumps([self.model_name, list(self.messages), self.customizations], sort_keys=True)
+        return hashlib.md5(payload.encode("utf-8")).hexdigest()
+
+    def _get_exact_reply(self, key):
+        entry = self._load_exact_cache().get(key)
+        if entry is None:
+            return None
+        if entry["expires"] < time.time():
+            del self._exact_cache[key]
+            return None
+        return entry["reply"]
+
+    def _store_exact_reply(self, key, reply):
+        cache = self._load_exact_cache()
+        now = time.time()
+        for stale in [k for k, entry in cache.items() if entry["expires"] < now]:
+            del cache[stale]
+        cache[key] = {"reply": reply, "expires": now + self.cache_ttl}
+        # Write to a temp file and swap it in so a crash never leaves a truncated cache
+        tmp_path = self.cache_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            self.logger.warning(f"Could not save response cache: {e}")
+
+    def _get_semantic_cache(self):
+        if self.semantic_cache_threshold is None:
+            return None
+        if self._semantic_cache is None:
+            try:
+                self._semantic_cache = _SemanticCache(self.semantic_cache_threshold)
+            except ImportError as e:
+                self.logger.warning(f"Semantic cache disabled, install sentence-transformers and faiss-cpu: {e}")
+                self.semantic_cache_threshold = None
+        return self._semantic_cache
 
     def prompt(self, user_prompt):
         if not self.api_token or not self.client:
@@ -37,56 +252,317 @@ class ChatGPT:
         
         self.messages.append({"role": "user", "content": user_prompt})
 
+        cached, cache_state = self._lookup_caches(user_prompt)
+        if cached is not None:
+            return cached
+
         try:
             response = self.client.chat.completions.create(
                 model=self.model_name,
-                messages=self.messages,
+                messages=list(self.messages),
                 **self.customizations
             )
             
             reply = response.choices[0].message.content
-            self.messages.append({"role": "assistant", "content": reply})
-            
-            self._log_message(user_prompt, reply)
+            self._record_reply(user_prompt, reply, cache_state)
             return reply
         except Exception as e:
             self.logger.error(f"OpenAI API error: {e}")
             raise Exception(f"OpenAI API error: {e}")
 
+    def prompt_stream(self, user_prompt):
+        # Yields reply text as it is generated; history, log and caches are updated once it completes
+        # or, without the caches, when the caller closes the generator early
+        if not self.api_token or not self.client:
+            raise Exception("API token not set.")
+
+        self.messages.append({"role": "user", "content": user_prompt})
+
+        cached, cache_state = self._lookup_caches(user_prompt)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model_name,
+                messages=list(self.messages),
+                stream=True,
+                **self.customizations
+            )
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except GeneratorExit:
+            # The consumer stopped early (e.g. speech was interrupted): keep the history
+            # alternating with what was actually delivered, but don't cache a truncated reply
+            stream.close()
+            self._record_reply(user_prompt, "".join(parts), (None, None, None, None))
+            raise
+        except Exception as e:
+            self.logger.error(f"OpenAI API error: {e}")
+            raise Exception(f"OpenAI API error: {e}")
+
+        self._record_reply(user_prompt, "".join(parts), cache_state)
+
+    def _lookup_caches(self, user_prompt):
+        # Identical conversations replay their stored reply
+        exact_key = None
+        if self.cache_ttl:
+            exact_key = self._exact_cache_key()
+            cached = self._get_exact_reply(exact_key)
+            if cached is not None:
+                self.logger.debug("Response cache hit")
+                self.messages.append({"role": "assistant", "content": cached})
+                self._log_message(user_prompt, cached)
+                return cached, None
+
+        # Near-duplicate questions are answered from the semantic cache without an API call.
+        # Only standalone questions are looked up or stored: the cache is keyed on the prompt
+        # alone, and a follow-up like "and tomorrow?" depends on turns the cached reply never saw
+        semantic_cache = self._get_semantic_cache() if len(self.messages) == 1 else None
+        embedding = None
+        signature = None
+        if semantic_cache is not None:
+            signature = semantic_cache.signature(user_prompt)
+            cached = semantic_cache.lookup_near_duplicate(signature)
+            if cached is None:
+                embedding = semantic_cache.embed(user_prompt)
+                cached = semantic_cache.lookup(embedding)
+            if cached is not None:
+                self.logger.debug("Semantic cache hit")
+                self.messages.append({"role": "assistant", "content": cached})
+                self._log_message(user_prompt, cached)
+                return cached, None
+
+        return None, (exact_key, semantic_cache, embedding, signature)
+
+    def _record_reply(self, user_prompt, reply, cache_state):
+        exact_key, semantic_cache, embedding, signature = cache_state
+        self.messages.append({"role": "assistant", "content": reply})
+        if embedding is not None:
+            semantic_cache.add(embedding, reply, signature)
+        if exact_key is not None:
+            self._store_exact_reply(exact_key, reply)
+        
+        self._log_message(user_prompt, reply)
+
+    def prompt_many(self, prompts, max_concurrency=8, max_retries=5):
+        # Independent one-turn prompts sent concurrently; replies come back in prompt order
+        if not self.api_token or not self.client:
+            raise Exception("API token not set.")
+
+        try:
+            return asyncio.run(self._prompt_many(prompts, max_concurrency, max_retries))
+        except Exception as e:
+            self.logger.error(f"OpenAI API error: {e}")
+            raise Exception(f"OpenAI API error: {e}")
+
+    async def _prompt_many(self, prompts, max_concurrency, max_retries):
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        # The async client's connection pool is tied to this event loop, so it lives for one batch
+        async with openai.AsyncOpenAI(api_key=self.api_token) as client:
+            async def _one(user_prompt):
+                async with semaphore:
+                    for attempt in range(max_retries + 1):
+                        try:
+                            response = await client.chat.completions.create(
+                                model=self.model_name,
+                                messages=[{"role": "user", "content": user_prompt}],
+                                **self.customizations
+                            )
+                            break
+                        except openai.RateLimitError as e:
+                            if attempt == max_retries:
+                                raise
+                            delay = 2 ** attempt
+                            self.logger.warning(f"Rate limited, retrying in {delay}s: {e}")
+                            await asyncio.sleep(delay)
+
+                reply = response.choices[0].message.content
+                self._log_message(user_prompt, reply)
+                return reply
+
+            return await asyncio.gather(*(_one(user_prompt) for user_prompt in prompts))
+
+    def submit_batch(self, prompts, completion_window="24h"):
+        # Offline prompts through the Batch API: half the cost, separate rate limits, no synchronous reply
+        if not self.api_token or not self.client:
+            raise Exception("API token not set.")
+
+        requests = []
+        for i, user_prompt in enumerate(prompts):
+            requests.append(json.dumps({
+                "custom_id": f"prompt-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model_name,
+                    "messages": [{"role": "user", "content": user_prompt}],
+                    **self.customizations
+                }
+            }))
+
+        try:
+            batch_file = self.client.files.create(
+                file=("batch.jsonl", "\n".join(requests).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window=completion_window
+            )
+        except Exception as e:
+            self.logger.error(f"OpenAI API error: {e}")
+            raise Exception(f"OpenAI API error: {e}")
+
+        self.logger.info(f"Submitted batch {batch.id} with {len(prompts)} prompts")
+        return batch.id
+
+    def wait_for_batch(self, batch_id, poll_interval=30, max_poll_interval=600):
+        # Returns {custom_id: reply}; custom ids are "prompt-<index>" as assigned by submit_batch
+        if not self.api_token or not self.client:
+            raise Exception("API token not set.")
+
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise Exception(f"OpenAI batch {batch_id} {batch.status}")
+            self.logger.debug(f"Batch {batch_id} is {batch.status}, checking again in {poll_interval}s")
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, max_poll_interval)
+
+        replies = {}
+        # Successful requests go to the output file and failed ones to the error file; a
+        # "completed" batch where every request failed has no output file at all
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                response = result.get("response") or {}
+                if response.get("status_code") != 200:
+                    error = result.get("error") or response.get("body")
+                    self.logger.warning(f"Batch request {result['custom_id']} failed: {error}")
+                    continue
+                replies[result["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+
+        if not batch.output_file_id:
+            self.logger.error(f"OpenAI batch {batch_id} completed without any successful requests")
+        return replies
+
     def clearMessages(self):
-        self.messages = []
+        self.messages.clear()
+        # Cleanup replaces both files, so the append handles are reopened afterwards
+        self._close_log_files()
         self._clean_old_logs()
+        self._open_log_files()
+
+    def _open_log_files(self):
+        self._log_fh = open(self.log_path, "ab", buffering=_LOG_BUFFER_SIZE)
+        self._index_fh = open(self.index_path, "ab", buffering=_LOG_BUFFER_SIZE)
+
+    def _close_log_files(self):
+        for fh in (self._log_fh, self._index_fh):
+            if fh is not None and not fh.closed:
+                fh.close()
 
     def _log_message(self, user, reply):
-        now = datetime.now()
-        timestamp = f"[{now.strftime('%Y-%m-%d')}, {now.strftime('%H:%M:%S')}]"
+        now = int(time.time())
+        timestamp = time.strftime("[%Y-%m-%d, %H:%M:%S]", time.localtime(now))
         log_entry = f"{timestamp}\nUser: {user}\nChatGPT: {reply}\n\n"
-        with open(self.log_path, "a", encoding="utf-8") as f:
-            f.write(log_entry)
+        offset = self._log_fh.tell()
+        self._log_fh.write(log_entry.encode("utf-8"))
+        # Sidecar index of (time, byte offset) per entry so cleanup can cut the log without parsing it
+        self._index_fh.write(_INDEX_ENTRY.pack(now, offset))
+
+    def _read_log_index(self):
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, "rb") as f:
+            data = f.read()
+        # Ignore a partially written trailing entry
+        data = data[:len(data) - len(data) % _INDEX_ENTRY.size]
+        return list(_INDEX_ENTRY.iter_unpack(data))
+
+    def _write_log_index(self, entries):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(_INDEX_ENTRY.pack(ts, offset) for ts, offset in entries))
+        os.replace(tmp_path, self.index_path)
 
     def _clean_old_logs(self):
         if not os.path.exists(self.log_path):
             return
-        new_lines = []
         cutoff = datetime.now() - timedelta(days=30)
-        with open(self.log_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        i = 0
-        while i < len(lines):
-            if lines[i].startswith('['):
-                date_str = lines[i].split(",")[0][1:]
-                try:
-                    log_date = datetime.strptime(date_str, '%Y-%m-%d')
-                except ValueError:
-                    i += 1
-                    continue
-                block = lines[i:i+4]
-                if log_date >= cutoff:
-                    new_lines.extend(block)
-                i += 4
-            else:
-                i += 1
-
-        with open(self.log_path, "w", encoding="utf-8") as f:
-            f.writelines(new_lines)
+        log_size = os.path.getsize(self.log_path)
+
+        entries = self._read_log_index()
+        if not entries or entries[0][1] != 0 or entries[-1][1] >= log_size:
+            # No index covering the whole log (e.g. written by an older version), parse it once
+            self._clean_old_logs_by_parsing(cutoff)
+            return
+
+        # Whole days are kept or dropped, the same rule as _clean_old_logs_by_parsing
+        keep_from = datetime.combine(cutoff.date() + timedelta(days=1), datetime.min.time())
+        first = bisect.bisect_left([ts for ts, _ in entries], int(keep_from.timestamp()))
+        if first == 0:
+            return
+        start = entries[first][1] if first < len(entries) else log_size
+        if start < log_size and not self._is_entry_start(start):
+            # The index doesn't describe this log (e.g. it was edited by hand)
+            self._clean_old_logs_by_parsing(cutoff)
+            return
+
+        # Only the still-valid tail is copied; nothing before it is read
+        tmp_path = self.log_path + ".tmp"
+        with open(self.log_path, "rb") as src, open(tmp_path, "wb") as dst:
+            src.seek(start)
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, self.log_path)
+        self._write_log_index([(ts, offset - start) for ts, offset in entries[first:]])
+
+    def _is_entry_start(self, offset):
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            return _LOG_HEADER_RE.match(f.read(14)) is not None
+
+    def _clean_old_logs_by_parsing(self, cutoff):
+        entries = []
+        offset = 0
+        # ISO dates compare correctly as bytes, so headers are never converted to datetimes
+        cutoff_date = cutoff.strftime('%Y-%m-%d').encode("ascii")
+        tmp_path = self.log_path + ".tmp"
+        with open(self.log_path, "rb") as src, open(tmp_path, "wb") as dst:
+            if os.fstat(src.fileno()).st_size:
+                with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # One regex pass over the mapped file finds every entry header
+                    starts = []
+                    dates = []
+                    for match in _LOG_HEADER_RE.finditer(mm):
+                        starts.append(match.start())
+                        dates.append(match.group(1))
+                    starts.append(len(mm))
+
+                    for i, log_date in enumerate(dates):
+                        # Entries are dated at midnight, so the cutoff day itself is already too old
+                        if log_date <= cutoff_date:
+                            continue
+                        block = mm[starts[i]:starts[i + 1]]
+                        dst.write(block)
+                        date_key = (int(log_date[0:4]), int(log_date[5:7]), int(log_date[8:10]))
+                        entries.append((int(time.mktime(date_key + (0, 0, 0, 0, 0, -1))), offset))
+                        offset += len(block)
+        os.replace(tmp_path, self.log_path)
+        self._write_log_index(entries)
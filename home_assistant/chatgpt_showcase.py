@@ -13,7 +13,18 @@ import time
 # Add src directory to Python path for logger import
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 from utils.logger import setup_logging
-from chatgpt import ChatGPT
+from chatgpt import ChatGPT, iter_sentences
+
+
+def create_tts(logger):
+    """Create the package TTS engine, or None if it can't be used here."""
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    try:
+        from home_assistant.speech.tts import TextToSpeech
+        return TextToSpeech()
+    except Exception as e:
+        logger.warning(f"TTS unavailable, streamed reply will only be logged: {e}")
+        return None
 
 
 def main():
@@ -57,6 +68,16 @@ def main():
         response = chatgpt.prompt("What's the capital of France?")
         logger.info(f"Response: {response}")
         
+        # Stream a reply and speak it sentence by sentence while the rest is still generating
+        logger.info("Testing streamed response...")
+        tts = create_tts(logger)
+        for sentence in iter_sentences(chatgpt.prompt_stream("Tell me two short facts about Paris.")):
+            logger.info(f"Sentence: {sentence}")
+            if tts:
+                tts.speak_async(sentence)
+        if tts:
+            tts.wait_until_spoken()
+        
         # Test cleanup
         logger.info("Cleaning up old messages...")
         chatgpt.clearMessages()
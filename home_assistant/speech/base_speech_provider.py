@@ -1,8 +1,15 @@
+import json
+import os
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, Tuple
 from ..utils.logger import setup_logging
 
 
+NOISE_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'home_assistant', 'noise.json')
+DEFAULT_NOISE_CACHE_TTL = 3600  # seconds
+
+
 class SpeechConfigurationError(Exception):
     """Raised when speech recognition provider configuration is invalid."""
     pass
@@ -113,4 +120,54 @@ class BaseSpeechProvider(ABC):
         elif success and not text:
             self.logger.warning("Speech detection succeeded but no text recognized")
         else:
-            self.logger.warning("Speech recognition failed or timed out")
\ No newline at end of file
+            self.logger.warning("Speech recognition failed or timed out")
+    
+    def _calibrate_ambient_noise(self, recognizer, microphone) -> None:
+        """
+        Set recognizer.energy_threshold for the current room noise.
+        
+        A threshold measured within the last noise_cache_ttl seconds is reused from
+        NOISE_CACHE_PATH; otherwise (or when the recalibrate option is set) one second
+        of ambient noise is sampled and the result is stored for later sessions.
+        
+        Args:
+            recognizer: speech_recognition.Recognizer to configure
+            microphone: speech_recognition.Microphone to sample from
+        """
+        key = self.__class__.__name__.lower()
+        ttl = self.config.get('noise_cache_ttl', DEFAULT_NOISE_CACHE_TTL)
+        cache = self._read_noise_cache()
+        
+        entry = cache.get(key)
+        if (not self.config.get('recalibrate', False) and isinstance(entry, dict)
+                and time.time() - entry.get('timestamp', 0) < ttl):
+            recognizer.energy_threshold = entry['energy_threshold']
+            self.logger.info(f"Using cached ambient noise threshold: {recognizer.energy_threshold:.1f}")
+            return
+        
+        with microphone as source:
+            self.logger.info("Adjusting for ambient noise...")
+            recognizer.adjust_for_ambient_noise(source, duration=1)
+        
+        cache[key] = {'energy_threshold': recognizer.energy_threshold, 'timestamp': time.time()}
+        self._write_noise_cache(cache)
+    
+    def _read_noise_cache(self) -> Dict[str, Any]:
+        """Load the persisted noise profiles, or an empty dict if there are none."""
+        try:
+            with open(NOISE_CACHE_PATH, 'r') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def _write_noise_cache(self, cache: Dict[str, Any]) -> None:
+        """Persist the noise profiles; failures only cost a recalibration next time."""
+        tmp_path = f"{NOISE_CACHE_PATH}.tmp"
+        try:
+            os.makedirs(os.path.dirname(NOISE_CACHE_PATH), exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, NOISE_CACHE_PATH)
+        except OSError as e:
+            self.logger.debug(f"Could not save ambient noise profile: {e}")
@@ -0,0 +1,107 @@
+import time
+from typing import Dict, Any, List
+from .base_tts_provider import BaseTTSProvider, TTSConfigurationError
+
+
+class FallbackTTS(BaseTTSProvider):
+    """TTS provider that delegates to an ordered list of providers, skipping dead ones."""
+
+    def __init__(self, *providers: BaseTTSProvider, cooldown: float = 60.0):
+        """
+        Initialize the fallback TTS wrapper.
+
+        Args:
+            *providers: TTS providers in order of preference
+            cooldown: Seconds to skip a provider after it fails
+        """
+        self._providers = list(providers)
+        self._dead = [0.0] * len(self._providers)
+        self.cooldown = cooldown
+        super().__init__(self._providers[0].config if self._providers else {})
+
+    def _validate_config(self) -> None:
+        """Validate that at least one provider was supplied."""
+        if not self._providers:
+            raise TTSConfigurationError("FallbackTTS requires at least one TTS provider")
+
+    def _initialize_provider(self) -> None:
+        """Wrapped providers are already initialized."""
+        pass
+
+    def _live_indices(self) -> List[int]:
+        """Get indices of providers that are not in their failure cooldown."""
+        now = time.monotonic()
+        return [i for i, dead_until in enumerate(self._dead) if dead_until <= now]
+
+    @property
+    def active_provider(self) -> BaseTTSProvider:
+        """The first provider that is not in its failure cooldown."""
+        live = self._live_indices()
+        return self._providers[live[0] if live else 0]
+
+    def is_available(self) -> bool:
+        """Check if any wrapped provider is available."""
+        return any(provider.is_available() for provider in self._providers)
+
+    def speak(self, text: str) -> bool:
+        """Speak the text with the first provider that succeeds."""
+        if not self._validate_text_input(text):
+            return False
+
+        # If every provider is cooling down, try them all anyway rather than staying silent
+        candidates = self._live_indices() or range(len(self._providers))
+
+        for i in candidates:
+            provider = self._providers[i]
+            try:
+                if provider.speak(text):
+                    self._dead[i] = 0.0
+                    return True
+                self.logger.warning(f"{provider.get_provider_name()} provider failed to speak, trying next provider")
+            except Exception as e:
+                self.logger.error(f"{provider.get_provider_name()} provider raised during speak: {e}")
+            self._dead[i] = time.monotonic() + self.cooldown
+
+        self.logger.error("All TTS providers failed")
+        return False
+
+    def get_provider_name(self) -> str:
+        """Get the name of the currently active provider."""
+        return self.active_provider.get_provider_name()
+
+    def get_provider_info(self) -> Dict[str, Any]:
+        """Get information about the active provider and the fallback chain."""
+        info = self.active_provider.get_provider_info()
+        info['fallback_chain'] = [provider.get_provider_name() for provider in self._providers]
+        return info
+
+    def get_available_voices(self) -> List[Dict[str, Any]]:
+        """Get available voices from the active provider."""
+        return self.active_provider.get_available_voices()
+
+    def set_voice(self, voice_id: str) -> bool:
+        """Set the voice on the active provider; voice ids are specific to each engine."""
+        return self.active_provider.set_voice(voice_id)
+
+    def _set_on_all(self, setter: str, value: Any) -> bool:
+        """
+        Apply a setting to every provider, so one returning from its cooldown keeps it too.
+
+        Returns:
+            bool: Whether the active provider accepted the setting
+        """
+        active = self.active_provider
+        result = False
+        for provider in self._providers:
+            accepted = getattr(provider, setter)(value)
+            if provider is active:
+                result = accepted
+        return result
+
+    def set_rate(self, rate: int) -> bool:
+        """Set the speech rate on every provider."""
+        return self._set_on_all('set_rate', rate)
+
+    def set_volume(self, volume: float) -> bool:
+        """Set the volume on every provider."""
+        return self._set_on_all('set_volume', volume)
@@ -1,7 +1,24 @@
+import threading
 import speech_recognition as sr
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Dict, Any, Optional, Tuple
 from ..base_speech_provider import BaseSpeechProvider, SpeechConfigurationError, SpeechProviderUnavailableError
 
+# Shared by all provider instances, since speech providers have no cleanup hook to
+# shut a per-instance pool down; room for a Google request, its Sphinx hedge and a
+# hedge from an earlier call that is still finishing in the background
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the recognition thread pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="speech-recognition")
+        return _executor
+
 
 class GoogleSpeechProvider(BaseSpeechProvider):
     """Speech recognition provider using Google Speech Recognition."""
@@ -21,6 +38,14 @@ class GoogleSpeechProvider(BaseSpeechProvider):
         if 'show_all' not in self.config:
             self.config['show_all'] = False
         
+        # Use offline Sphinx recognition when the Google request fails
+        if 'sphinx_fallback' not in self.config:
+            self.config['sphinx_fallback'] = False
+        
+        # Seconds Google may take before Sphinx starts decoding alongside it
+        if 'sphinx_fallback_delay' not in self.config:
+            self.config['sphinx_fallback_delay'] = 0.5
+        
         # Validate language code format
         language = self.config['language']
         if not isinstance(language, str) or len(language) < 2:
@@ -36,10 +61,8 @@ class GoogleSpeechProvider(BaseSpeechProvider):
             self.recognizer = sr.Recognizer()
             self.microphone = sr.Microphone()
             
-            # Adjust for ambient noise
-            with self.microphone as source:
-                self.logger.info("Adjusting for ambient noise...")
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+            # Adjust for ambient noise (reuses the persisted profile when fresh)
+            self._calibrate_ambient_noise(self.recognizer, self.microphone)
             
             self.logger.info("Google Speech Recognition initialized")
             
@@ -62,13 +85,16 @@ class GoogleSpeechProvider(BaseSpeechProvider):
                 audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_timeout)
             
             # Recognize speech using Google
-            self.logger.debug(f"Sending audio to Google Speech API (language: {self.config['language']})")
+            self.logger.debug("Sending audio to Google Speech API (language: %s)", self.config['language'])
             
-            text = self.recognizer.recognize_google(
-                audio, 
-                language=self.config['language'],
-                show_all=self.config['show_all']
-            )
+            if self.config['sphinx_fallback']:
+                text = self._recognize_with_sphinx_fallback(audio)
+            else:
+                text = self.recognizer.recognize_google(
+                    audio, 
+                    language=self.config['language'],
+                    show_all=self.config['show_all']
+                )
             
             if isinstance(text, str) and text.strip():
                 text = text.strip()
@@ -83,7 +109,7 @@ class GoogleSpeechProvider(BaseSpeechProvider):
                     
                     if best_text:
                         self._log_speech_result(True, best_text)
-                        self.logger.debug(f"Google confidence: {confidence:.2f}")
+                        self.logger.debug("Google confidence: %.2f", confidence)
                         return True, best_text
             
             self.logger.warning("Google returned empty or invalid result")
@@ -107,6 +133,47 @@ class GoogleSpeechProvider(BaseSpeechProvider):
             self._log_speech_result(False, None)
             return False, None
     
+    def _recognize_with_sphinx_fallback(self, audio):
+        """
+        Recognize with Google, falling back to offline Sphinx when the request fails.
+        
+        Sphinx decoding costs a full CPU-bound pass, so it is only started once Google
+        has been outstanding for sphinx_fallback_delay seconds; a slow or failing
+        network then costs max(google, delay + sphinx) instead of their sum.
+        """
+        executor = _get_executor()
+        google = executor.submit(
+            self.recognizer.recognize_google,
+            audio,
+            language=self.config['language'],
+            show_all=self.config['show_all']
+        )
+        
+        sphinx = None
+        try:
+            try:
+                return google.result(timeout=self.config['sphinx_fallback_delay'])
+            except FutureTimeoutError:
+                sphinx = executor.submit(self._sphinx_hedge, google, audio)
+            return google.result()
+        except sr.RequestError as e:
+            self.logger.warning(f"Google Speech API request failed, using offline Sphinx result: {e}")
+            if sphinx is None:
+                return self.recognizer.recognize_sphinx(audio, language=self.config['language'])
+            return sphinx.result()
+        finally:
+            # Drop a hedge that is still queued; a Sphinx run that already started
+            # can't be stopped and finishes in the background
+            if sphinx is not None:
+                sphinx.cancel()
+    
+    def _sphinx_hedge(self, google, audio):
+        """Decode with Sphinx unless the Google request has already succeeded."""
+        # A worker freed by Google can pick the hedge up before the caller cancels it
+        if google.done() and google.exception() is None:
+            return None
+        return self.recognizer.recognize_sphinx(audio, language=self.config['language'])
+    
     def is_available(self) -> bool:
         """Check if Google provider is available."""
         return (self.recognizer is not None and self.microphone is not None)
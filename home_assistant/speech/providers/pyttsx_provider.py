@@ -1,19 +1,38 @@
 import pyttsx3
 import sounddevice as sd
+import logging
 import platform
-import time
+import re
+import threading
 from typing import Dict, Any, List, Optional
 from ..base_tts_provider import BaseTTSProvider, TTSConfigurationError, TTSProviderUnavailableError
 
 
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Returns the output volume as it was before raising it to 75% when below 50%
+_VOLUME_SCRIPT = (
+    'set currentVolume to output volume of (get volume settings)',
+    'if currentVolume < 50 then set volume output volume 75',
+    'return currentVolume'
+)
+
+
 class PyttsxTTSProvider(BaseTTSProvider):
     """TTS provider using pyttsx3 with eSpeak-NG backend."""
     
+    # PortAudio device list shared by all instances; see refresh_devices()
+    _DEVICES_CACHE = None
+    
     def __init__(self, config: Dict[str, Any]):
         """Initialize the pyttsx3 TTS provider."""
         self.engine = None
         self.platform = platform.system().lower()
-        self.needs_reinitialization = self.platform in ['darwin', 'linux']
+        # One engine is reused for every utterance; runAndWait() must not be entered concurrently
+        self._speak_lock = threading.Lock()
+        # Voice enumeration is slow on some drivers, so it is done once per provider
+        self._voices = None
+        self._voice_by_id = {}
         super().__init__(config)
     
     def _validate_config(self) -> None:
@@ -46,14 +65,16 @@ class PyttsxTTSProvider(BaseTTSProvider):
     def _check_audio_devices(self):
         """Check and configure audio devices."""
         try:
-            devices = sd.query_devices()
+            if PyttsxTTSProvider._DEVICES_CACHE is None:
+                PyttsxTTSProvider._DEVICES_CACHE = sd.query_devices()
+            devices = PyttsxTTSProvider._DEVICES_CACHE
             self.logger.info(f"Found {len(devices)} audio devices")
             
             output_devices = []
             for i, device in enumerate(devices):
                 if device['max_output_channels'] > 0:
                     output_devices.append((i, device))
-                    self.logger.debug(f"Output {i}: {device['name']} (channels: {device['max_output_channels']})")
+                    self.logger.debug("Output %d: %s (channels: %d)", i, device['name'], device['max_output_channels'])
             
             # Configure default device
             try:
@@ -69,22 +90,35 @@ class PyttsxTTSProvider(BaseTTSProvider):
         if self.platform == 'darwin':
             self._ensure_system_volume()
     
+    @classmethod
+    def refresh_devices(cls):
+        """Forget the cached audio device list, e.g. after a device was plugged in."""
+        cls._DEVICES_CACHE = None
+    
     def _ensure_system_volume(self):
         """Ensure system volume is adequate for TTS (macOS only)."""
         try:
             import subprocess
-            result = subprocess.run(['osascript', '-e', 'output volume of (get volume settings)'], 
-                                  capture_output=True, text=True)
+            # Read and, if needed, raise the volume in one osascript process
+            args = ['osascript']
+            for line in _VOLUME_SCRIPT:
+                args += ['-e', line]
+            result = subprocess.run(args, capture_output=True, text=True)
             current_volume = int(result.stdout.strip())
             
             if current_volume < 50:
-                subprocess.run(['osascript', '-e', 'set volume output volume 75'], 
-                              capture_output=True)
                 self.logger.info(f"System volume was {current_volume}%, increased to 75% for TTS")
             
         except Exception as e:
             self.logger.warning(f"Could not adjust system volume: {e}")
     
+    def _get_voices(self):
+        """Get the engine's voices, enumerating them only on first use."""
+        if self._voices is None:
+            self._voices = self.engine.getProperty('voices') or []
+            self._voice_by_id = {voice.id: voice for voice in self._voices}
+        return self._voices
+    
     def _configure_voice(self):
         """Configure voice properties."""
         if not self.engine:
@@ -92,21 +126,17 @@ class PyttsxTTSProvider(BaseTTSProvider):
         
         try:
             # Get all available voices
-            voices = self.engine.getProperty('voices')
+            voices = self._get_voices()
             if voices:
                 self.logger.info(f"Found {len(voices)} available voices")
                 
                 # Use specified voice or default selection
                 if self.config.get('voice_id'):
-                    voice_found = False
-                    for voice in voices:
-                        if voice.id == self.config['voice_id']:
-                            self.engine.setProperty('voice', voice.id)
-                            self.logger.info(f"Using specified voice: {voice.name}")
-                            voice_found = True
-                            break
-                    
-                    if not voice_found:
+                    voice = self._voice_by_id.get(self.config['voice_id'])
+                    if voice is not None:
+                        self.engine.setProperty('voice', voice.id)
+                        self.logger.info(f"Using specified voice: {voice.name}")
+                    else:
                         self.logger.warning(f"Specified voice ID '{self.config['voice_id']}' not found, using default")
                         self._select_default_voice(voices)
                 else:
@@ -116,10 +146,7 @@ class PyttsxTTSProvider(BaseTTSProvider):
             self.engine.setProperty('rate', self.config['rate'])
             self.engine.setProperty('volume', self.config['volume'])
             
-            # Verify settings
-            final_rate = self.engine.getProperty('rate')
-            final_volume = self.engine.getProperty('volume')
-            self.logger.info(f"TTS configured - Rate: {final_rate}, Volume: {final_volume}")
+            self.logger.info(f"TTS configured - Rate: {self.config['rate']}, Volume: {self.config['volume']}")
             
         except Exception as e:
             self.logger.error(f"Failed to configure voice: {e}")
@@ -140,6 +167,9 @@ class PyttsxTTSProvider(BaseTTSProvider):
     
     def is_available(self) -> bool:
         """Check if pyttsx3 is available."""
+        # pyttsx3.init() hands back the engine already in use, so probing it with stop() would disturb speech
+        if self.engine is not None:
+            return True
         try:
             test_engine = pyttsx3.init()
             test_engine.stop()
@@ -159,48 +189,18 @@ class PyttsxTTSProvider(BaseTTSProvider):
         try:
             self._log_speech_attempt(text)
             
-            # Platform-aware engine management
-            if self.needs_reinitialization:
-                self.logger.debug(f"Reinitializing engine for {self.platform} platform")
-                self._initialize_provider()
-                if not self.engine:
-                    self.logger.error("Failed to reinitialize TTS engine")
-                    return False
-                
-                self._configure_voice()
-                
-                # macOS-specific settling time
-                if self.platform == 'darwin':
-                    time.sleep(0.1)
-                
-                # Apply settings with retries for macOS consistency
-                for attempt in range(3):
-                    self.engine.setProperty('rate', self.config['rate'])
-                    self.engine.setProperty('volume', self.config['volume'])
-                    
+            with self._speak_lock:
+                # Reading properties back is a bridge call per property on macOS, so only do it for debugging
+                if self.logger.isEnabledFor(logging.DEBUG):
                     actual_rate = self.engine.getProperty('rate')
                     actual_volume = self.engine.getProperty('volume')
-                    
-                    if abs(actual_rate - self.config['rate']) < 1 and abs(actual_volume - self.config['volume']) < 0.1:
-                        break
-                    
-                    if attempt < 2:
-                        time.sleep(0.05)
-            else:
-                # Windows - reuse existing engine
-                if not self.engine:
-                    self._initialize_provider()
-                    self._configure_voice()
-            
-            # Verify final settings
-            if self.engine:
-                actual_rate = self.engine.getProperty('rate')
-                actual_volume = self.engine.getProperty('volume')
-                self.logger.debug(f"Final settings: Rate={actual_rate}, Volume={actual_volume}")
-            
-            # Speak the text
-            self.engine.say(text)
-            self.engine.runAndWait()
+                    self.logger.debug(f"Final settings: Rate={actual_rate}, Volume={actual_volume}")
+                
+                # Queue one utterance per sentence so the driver can render the next while one plays
+                for sentence in _SENTENCE_SPLIT_RE.split(text.strip()):
+                    if sentence:
+                        self.engine.say(sentence)
+                self.engine.runAndWait()
             
             self.logger.info("TTS completed successfully")
             return True
@@ -214,7 +214,7 @@ class PyttsxTTSProvider(BaseTTSProvider):
             return []
         
         try:
-            voices = self.engine.getProperty('voices')
+            voices = self._get_voices()
             if not voices:
                 return []
             
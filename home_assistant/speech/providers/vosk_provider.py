@@ -103,10 +103,8 @@ class VoskSpeechProvider(BaseSpeechProvider):
             self.sr_recognizer = sr.Recognizer()
             self.microphone = sr.Microphone(sample_rate=self.config['sample_rate'])
             
-            # Adjust for ambient noise
-            with self.microphone as source:
-                self.logger.info("Adjusting for ambient noise...")
-                self.sr_recognizer.adjust_for_ambient_noise(source, duration=1)
+            # Adjust for ambient noise (reuses the persisted profile when fresh)
+            self._calibrate_ambient_noise(self.sr_recognizer, self.microphone)
                 
         except Exception as e:
             raise SpeechProviderUnavailableError(f"Failed to initialize microphone: {e}")
@@ -141,7 +139,7 @@ class VoskSpeechProvider(BaseSpeechProvider):
             
             if text and confidence >= self.config['confidence_threshold']:
                 self._log_speech_result(True, text)
-                self.logger.debug(f"Vosk confidence: {confidence:.2f}")
+                self.logger.debug("Vosk confidence: %.2f", confidence)
                 return True, text
             else:
                 if text:
@@ -1,13 +1,13 @@
-import tempfile
-import os
-import wave
 import speech_recognition as sr
 from typing import Dict, Any, Optional, Tuple
 from ..base_speech_provider import BaseSpeechProvider, SpeechConfigurationError, SpeechProviderUnavailableError
 
 
+_VALID_BACKENDS = ['openai-whisper', 'faster-whisper']
+
+
 class WhisperSpeechProvider(BaseSpeechProvider):
-    """Speech recognition provider using OpenAI Whisper."""
+    """Speech recognition provider using OpenAI Whisper or its CTranslate2 port faster-whisper."""
     
     def __init__(self, config: Dict[str, Any]):
         """Initialize the Whisper speech provider."""
@@ -31,6 +31,19 @@ class WhisperSpeechProvider(BaseSpeechProvider):
         if 'temperature' not in self.config:
             self.config['temperature'] = 0.0
         
+        if 'backend' not in self.config:
+            self.config['backend'] = 'openai-whisper'
+        
+        # Only used by faster-whisper; int8 quantization runs fastest on CPU
+        if 'compute_type' not in self.config:
+            self.config['compute_type'] = 'int8'
+        
+        # Validate backend
+        if self.config['backend'] not in _VALID_BACKENDS:
+            raise SpeechConfigurationError(
+                f"Invalid Whisper backend '{self.config['backend']}'. Valid options: {_VALID_BACKENDS}"
+            )
+        
         # Validate model name
         valid_models = ['tiny', 'base', 'small', 'medium', 'large', 'large-v2', 'large-v3']
         if self.config['model'] not in valid_models:
@@ -62,19 +75,29 @@ class WhisperSpeechProvider(BaseSpeechProvider):
         """Initialize the Whisper speech recognition provider."""
         # Check if Whisper is available
         try:
-            import whisper
+            if self.config['backend'] == 'faster-whisper':
+                from faster_whisper import WhisperModel
+            else:
+                import whisper
         except ImportError:
             raise SpeechProviderUnavailableError(
-                "OpenAI Whisper not installed. Install with: pip install openai-whisper"
+                f"{self.config['backend']} not installed. Install with: pip install {self.config['backend']}"
             )
         
         # Load Whisper model
         try:
-            self.logger.info(f"Loading Whisper model '{self.config['model']}' on {self.config['device']}...")
-            self.whisper_model = whisper.load_model(
-                self.config['model'], 
-                device=self.config['device']
-            )
+            self.logger.info(f"Loading Whisper model '{self.config['model']}' on {self.config['device']} ({self.config['backend']})...")
+            if self.config['backend'] == 'faster-whisper':
+                self.whisper_model = WhisperModel(
+                    self.config['model'],
+                    device=self.config['device'],
+                    compute_type=self.config['compute_type']
+                )
+            else:
+                self.whisper_model = whisper.load_model(
+                    self.config['model'], 
+                    device=self.config['device']
+                )
             self.logger.info(f"Whisper model '{self.config['model']}' loaded successfully")
             
         except Exception as e:
@@ -85,10 +108,8 @@ class WhisperSpeechProvider(BaseSpeechProvider):
             self.recognizer = sr.Recognizer()
             self.microphone = sr.Microphone()
             
-            # Adjust for ambient noise
-            with self.microphone as source:
-                self.logger.info("Adjusting for ambient noise...")
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+            # Adjust for ambient noise (reuses the persisted profile when fresh)
+            self._calibrate_ambient_noise(self.recognizer, self.microphone)
                 
         except Exception as e:
             raise SpeechProviderUnavailableError(f"Failed to initialize microphone: {e}")
@@ -108,50 +129,25 @@ class WhisperSpeechProvider(BaseSpeechProvider):
                 self.logger.debug("Listening for speech...")
                 audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_timeout)
             
-            # Convert audio to WAV file for Whisper
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-                temp_audio_path = temp_audio.name
-                
-                # Write audio data to WAV file
-                with wave.open(temp_audio_path, 'wb') as wav_file:
-                    wav_file.setnchannels(1)  # Mono
-                    wav_file.setsampwidth(audio.sample_width)
-                    wav_file.setframerate(audio.sample_rate)
-                    wav_file.writeframes(audio.frame_data)
+            # Whisper takes 16 kHz float samples directly, no temporary WAV file or ffmpeg decode
+            import numpy as np
+            pcm = audio.get_raw_data(convert_rate=16000, convert_width=2)
+            samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
             
-            try:
-                # Process with Whisper
-                self.logger.debug("Processing audio with Whisper...")
-                
-                transcribe_options = {
-                    'temperature': self.config['temperature'],
-                    'fp16': self.config['device'] == 'cuda'  # Use FP16 on GPU
-                }
-                
-                if self.config['language']:
-                    transcribe_options['language'] = self.config['language']
-                
-                result = self.whisper_model.transcribe(temp_audio_path, **transcribe_options)
-                
-                text = result.get('text', '').strip()
-                
-                if text:
-                    self._log_speech_result(True, text)
-                    # Log additional Whisper info if available
-                    if 'language' in result:
-                        self.logger.debug(f"Detected language: {result['language']}")
-                    return True, text
-                else:
-                    self.logger.warning("Whisper returned empty text")
-                    self._log_speech_result(False, None)
-                    return False, None
-                    
-            finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(temp_audio_path)
-                except OSError:
-                    pass
+            # Process with Whisper
+            self.logger.debug("Processing audio with Whisper...")
+            text, language = self._transcribe(samples)
+            
+            if text:
+                self._log_speech_result(True, text)
+                # Log additional Whisper info if available
+                if language:
+                    self.logger.debug("Detected language: %s", language)
+                return True, text
+            else:
+                self.logger.warning("Whisper returned empty text")
+                self._log_speech_result(False, None)
+                return False, None
                 
         except sr.WaitTimeoutError:
             self.logger.warning("Speech recognition timed out")
@@ -162,6 +158,33 @@ class WhisperSpeechProvider(BaseSpeechProvider):
             self._log_speech_result(False, None)
             return False, None
     
+    def _transcribe(self, samples) -> Tuple[str, Optional[str]]:
+        """
+        Transcribe 16 kHz mono float32 samples with the configured backend.
+        
+        Returns:
+            Tuple[str, Optional[str]]: (text, detected_language)
+        """
+        if self.config['backend'] == 'faster-whisper':
+            segments, info = self.whisper_model.transcribe(
+                samples,
+                beam_size=1,
+                temperature=self.config['temperature'],
+                language=self.config['language']
+            )
+            return ''.join(segment.text for segment in segments).strip(), info.language
+        
+        transcribe_options = {
+            'temperature': self.config['temperature'],
+            'fp16': self.config['device'] == 'cuda'  # Use FP16 on GPU
+        }
+        
+        if self.config['language']:
+            transcribe_options['language'] = self.config['language']
+        
+        result = self.whisper_model.transcribe(samples, **transcribe_options)
+        return result.get('text', '').strip(), result.get('language')
+    
     def is_available(self) -> bool:
         """Check if Whisper provider is available."""
         return (self.whisper_model is not None and 
@@ -184,6 +207,7 @@ class WhisperSpeechProvider(BaseSpeechProvider):
         if self.is_available():
             info.update({
                 'model': self.config['model'],
+                'backend': self.config['backend'],
                 'language': self.config['language'] or 'auto-detect',
                 'device': self.config['device'],
                 'temperature': self.config['temperature'],
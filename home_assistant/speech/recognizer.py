@@ -1,6 +1,6 @@
-import yaml
 import os
 from typing import Optional, Dict, Any, Tuple
+from ..utils.config import load_yaml
 from ..utils.logger import setup_logging
 from .base_speech_provider import BaseSpeechProvider, SpeechConfigurationError, SpeechProviderUnavailableError
 from .providers.vosk_provider import VoskSpeechProvider
@@ -11,13 +11,16 @@ from .providers.whisper_provider import WhisperSpeechProvider
 class SpeechRecognizer:
     """Factory-based Speech Recognition system supporting multiple speech providers."""
     
-    def __init__(self, provider_name: Optional[str] = None):
+    def __init__(self, provider_name: Optional[str] = None, recalibrate: bool = False):
         self.logger = setup_logging("home_assistant.speech.recognizer")
         self.config = self._load_config()
         
         # Determine which provider to use
         self.provider_name = provider_name or self.config.get('speech', {}).get('provider', 'vosk')
         
+        # Force a fresh ambient noise measurement instead of the persisted profile
+        self.recalibrate = recalibrate
+        
         # Initialize the speech recognition provider
         self.provider = self._create_provider()
         
@@ -27,8 +30,7 @@ class SpeechRecognizer:
         """Load configuration from config.yaml file."""
         config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config.yaml')
         try:
-            with open(config_path, 'r') as file:
-                return yaml.safe_load(file)
+            return load_yaml(config_path)
         except Exception as e:
             self.logger.warning(f"Could not load config.yaml: {e}. Using default speech recognition settings")
             return {}
@@ -43,6 +45,9 @@ class SpeechRecognizer:
         if 'language' not in provider_config and self.provider_name in ['google', 'whisper']:
             provider_config['language'] = global_language
         
+        if self.recalibrate:
+            provider_config['recalibrate'] = True
+        
         try:
             if self.provider_name == 'vosk':
                 return VoskSpeechProvider(provider_config)
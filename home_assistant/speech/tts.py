@@ -1,11 +1,23 @@
-import yaml
 import os
+import queue
+import threading
 from typing import Optional, Dict, Any
+from ..utils.config import load_yaml
 from ..utils.logger import setup_logging
 from .base_tts_provider import BaseTTSProvider, TTSConfigurationError, TTSProviderUnavailableError
 from .providers.pyttsx_provider import PyttsxTTSProvider
 from .providers.espeak_provider import EspeakTTSProvider
 from .providers.piper_provider import PiperTTSProvider
+from .fallback_tts import FallbackTTS
+
+
+_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'config.yaml')
+
+_PROVIDER_CLASSES = {
+    'pyttsx': PyttsxTTSProvider,
+    'espeak': EspeakTTSProvider,
+    'piper': PiperTTSProvider
+}
 
 
 class TextToSpeech:
@@ -21,43 +33,45 @@ class TextToSpeech:
         # Initialize the TTS provider
         self.provider = self._create_provider()
         
+        # Background playback for speak_async(), started on first use
+        self._speak_queue: Optional[queue.Queue] = None
+        self._speak_lock = threading.Lock()
+        
         self.logger.info(f"TTS initialized with {self.provider_name} provider")
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from config.yaml file."""
-        config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config.yaml')
         try:
-            with open(config_path, 'r') as file:
-                return yaml.safe_load(file)
+            return load_yaml(_CONFIG_PATH)
         except Exception as e:
             self.logger.warning(f"Could not load config.yaml: {e}. Using default TTS settings")
             return {}
     
     def _create_provider(self) -> BaseTTSProvider:
-        """Create TTS provider based on configuration."""
-        provider_config = self.config.get('tts', {}).get('providers', {}).get(self.provider_name, {})
+        """Create TTS provider chain based on configuration, with pyttsx as fallback."""
+        providers_config = self.config.get('tts', {}).get('providers', {})
         
-        try:
-            if self.provider_name == 'pyttsx':
-                return PyttsxTTSProvider(provider_config)
-            elif self.provider_name == 'espeak':
-                return EspeakTTSProvider(provider_config)
-            elif self.provider_name == 'piper':
-                return PiperTTSProvider(provider_config)
-            else:
-                self.logger.warning(f"Unknown TTS provider '{self.provider_name}', falling back to pyttsx")
-                return PyttsxTTSProvider(provider_config)
-        except (TTSConfigurationError, TTSProviderUnavailableError) as e:
-            self.logger.error(f"Failed to initialize {self.provider_name} provider: {e}")
-            # Try to fallback to pyttsx if it's not already the current provider
-            if self.provider_name != 'pyttsx':
-                self.logger.info("Attempting fallback to pyttsx provider...")
-                try:
-                    fallback_config = self.config.get('tts', {}).get('providers', {}).get('pyttsx', {})
-                    return PyttsxTTSProvider(fallback_config)
-                except Exception as fallback_error:
-                    self.logger.error(f"Fallback to pyttsx also failed: {fallback_error}")
-            raise e
+        if self.provider_name in _PROVIDER_CLASSES:
+            provider_names = [self.provider_name]
+        else:
+            self.logger.warning(f"Unknown TTS provider '{self.provider_name}', falling back to pyttsx")
+            provider_names = []
+        if 'pyttsx' not in provider_names:
+            provider_names.append('pyttsx')
+        
+        providers = []
+        last_error = None
+        for name in provider_names:
+            try:
+                providers.append(_PROVIDER_CLASSES[name](providers_config.get(name, {})))
+            except (TTSConfigurationError, TTSProviderUnavailableError) as e:
+                self.logger.error(f"Failed to initialize {name} provider: {e}")
+                last_error = e
+        
+        if not providers:
+            raise last_error
+        
+        return FallbackTTS(*providers)
     
     def get_available_providers(self) -> Dict[str, bool]:
         """Get list of available TTS providers and their availability status."""
@@ -88,6 +102,11 @@ class TextToSpeech:
         
         return providers
     
+    @staticmethod
+    def refresh_devices():
+        """Re-query audio devices on next use, e.g. after a device was hot-plugged."""
+        PyttsxTTSProvider.refresh_devices()
+    
     def get_provider_info(self) -> Dict[str, Any]:
         """Get information about the current TTS provider."""
         return self.provider.get_provider_info()
@@ -132,4 +151,37 @@ class TextToSpeech:
         Returns:
             bool: True if successful, False otherwise
         """
-        return self.provider.speak(text)
\ No newline at end of file
+        return self.provider.speak(text)
+    
+    def speak_async(self, text: str) -> None:
+        """
+        Queue text to be spoken on a background thread and return immediately.
+        
+        Utterances are played in the order they were queued. Use wait_until_spoken()
+        before listening again so the microphone doesn't pick up the assistant's voice.
+        
+        Args:
+            text: The text to speak
+        """
+        with self._speak_lock:
+            if self._speak_queue is None:
+                self._speak_queue = queue.Queue()
+                threading.Thread(target=self._speak_worker, name="tts-playback", daemon=True).start()
+        self._speak_queue.put(text)
+    
+    def wait_until_spoken(self) -> None:
+        """Block until everything queued with speak_async() has been spoken."""
+        if self._speak_queue is not None:
+            self._speak_queue.join()
+    
+    def _speak_worker(self) -> None:
+        """Play queued utterances one after another."""
+        while True:
+            text = self._speak_queue.get()
+            try:
+                if not self.provider.speak(text):
+                    self.logger.warning(f"Queued utterance was not spoken: '{text}'")
+            except Exception as e:
+                self.logger.error(f"TTS playback error: {e}")
+            finally:
+                self._speak_queue.task_done()
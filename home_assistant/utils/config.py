@@ -1,15 +1,71 @@
 import yaml
 import os
-from typing import Dict, Any, Optional
+import copy
+import functools
+import threading
+import types
+from typing import Dict, Any, Optional, Mapping, Tuple
 from .logger import setup_logging
 
+# LibYAML's C loader is much faster; fall back to the pure-Python one if PyYAML was built without it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_yaml(path: str, mtime_ns: int, size: int, inode: int) -> Any:
+    # Bytes go straight to the parser, which detects the encoding itself
+    with open(path, 'rb') as file:
+        return yaml.load(file, Loader=_YAML_LOADER)
+
+
+def _freeze(value: Any) -> Any:
+    """Build a read-only copy of a parsed config tree: dicts become mapping proxies, lists tuples."""
+    if isinstance(value, dict):
+        return types.MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Undo _freeze: build plain dicts and lists that YAML can dump."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(item) for item in value]
+    return value
+
+
+_EMPTY: Mapping[str, Any] = types.MappingProxyType({})
+
+
+def load_yaml(path: str) -> Any:
+    """
+    Load a YAML file, reusing the parsed result while the file is unchanged.
+    
+    Args:
+        path: Path to the YAML file
+        
+    Returns:
+        The parsed document as a deep copy that callers may modify
+    """
+    stat = os.stat(path)
+    parsed = _parse_yaml(os.path.abspath(path), stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    return copy.deepcopy(parsed)
+
 
 class ConfigManager:
     def __init__(self, config_path: str = "config.yaml"):
         self.config_path = config_path
         self.logger = setup_logging("home_assistant.config")
+        # Guards writers only; readers see immutable snapshots that are swapped in whole
+        self._lock = threading.RLock()
         self._config = self._load_config()
         self._ai_config = self._load_ai_config()
+        self._ai_config_merged: Optional[Mapping[str, Any]] = None
+        # (config dict, read-only view of it); rebuilt whenever _config is replaced
+        self._config_view: Optional[Tuple[Dict[str, Any], Mapping[str, Any]]] = None
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file, create default if not exists."""
@@ -17,8 +73,7 @@ class ConfigManager:
             self._create_default_config()
         
         try:
-            with open(self.config_path, 'r') as file:
-                return yaml.safe_load(file) or {}
+            return load_yaml(self.config_path) or {}
         except Exception as e:
             self.logger.error(f"Error loading config: {e}")
             return {}
@@ -63,19 +118,15 @@ class ConfigManager:
     
     def get_wake_word(self) -> Optional[str]:
         """Get the configured wake word name."""
-        return self._config.get('wake_word', {}).get('name')
+        return self.get_config().get('wake_word', _EMPTY).get('name')
     
     def set_wake_word(self, name: str):
         """Set the wake word name and save to config."""
-        if 'wake_word' not in self._config:
-            self._config['wake_word'] = {}
-        
-        self._config['wake_word']['name'] = name
-        self.save_config(self._config)
+        self._set_value(('wake_word', 'name'), name)
     
-    def get_wake_word_detection_config(self) -> Dict[str, Any]:
-        """Get the wake word detection configuration."""
-        return self._config.get('wake_word', {}).get('detection', {})
+    def get_wake_word_detection_config(self) -> Mapping[str, Any]:
+        """Get a read-only view of the wake word detection configuration."""
+        return self.get_config().get('wake_word', _EMPTY).get('detection', _EMPTY)
     
     def get_wake_word_provider(self) -> str:
         """Get the configured wake word detection provider."""
@@ -84,29 +135,68 @@ class ConfigManager:
     
     def set_wake_word_provider(self, provider: str):
         """Set the wake word detection provider and save to config."""
-        if 'wake_word' not in self._config:
-            self._config['wake_word'] = {}
-        if 'detection' not in self._config['wake_word']:
-            self._config['wake_word']['detection'] = {}
+        self._set_value(('wake_word', 'detection', 'provider'), provider)
+    
+    def get_config(self) -> Mapping[str, Any]:
+        """
+        Get a read-only view of the full configuration.
         
-        self._config['wake_word']['detection']['provider'] = provider
-        self.save_config(self._config)
+        Nested sections are read-only too (lists become tuples); use
+        get_mutable_config() to build a modified configuration.
+        """
+        cached = self._config_view
+        if cached is None or cached[0] is not self._config:
+            config = self._config
+            cached = self._config_view = (config, _freeze(config))
+        return cached[1]
     
-    def get_config(self) -> Dict[str, Any]:
-        """Get the full configuration."""
-        return self._config.copy()
+    def get_mutable_config(self) -> Dict[str, Any]:
+        """Get a deep copy of the full configuration that can be modified and passed to save_config."""
+        return copy.deepcopy(self._config)
     
-    def save_config(self, config: Dict[str, Any] = None):
-        """Save configuration to YAML file."""
-        if config is None:
-            config = self._config
+    def save_config(self, config: Mapping[str, Any] = None):
+        """Save configuration to YAML file; read-only views from get_config() are accepted too."""
+        with self._lock:
+            if config is None:
+                config = self._config
+            else:
+                config = _thaw(config)
+            
+            # Write a sibling temp file and swap it in, so a crash never leaves a torn config
+            tmp_path = f"{self.config_path}.tmp"
+            try:
+                with open(tmp_path, 'w') as file:
+                    yaml.dump(config, file, Dumper=_YAML_DUMPER, default_flow_style=False, indent=2)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(tmp_path, self.config_path)
+                self._config = config
+                self._ai_config_merged = None
+            except Exception as e:
+                self.logger.error(f"Error saving config: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+    
+    def _set_value(self, keys: Tuple[str, ...], value: Any):
+        """
+        Update a nested setting copy-on-write and save it.
         
-        try:
-            with open(self.config_path, 'w') as file:
-                yaml.dump(config, file, default_flow_style=False, indent=2)
+        Only the dicts along keys are copied, so snapshots handed out by
+        get_config() are never modified under a reader.
+        """
+        with self._lock:
+            config = dict(self._config)
+            node = config
+            for key in keys[:-1]:
+                child = node.get(key)
+                node[key] = child = dict(child) if isinstance(child, dict) else {}
+                node = child
+            node[keys[-1]] = value
+            
+            # Publish even if the write fails, matching the previous in-place update
             self._config = config
-        except Exception as e:
-            self.logger.error(f"Error saving config: {e}")
+            self._ai_config_merged = None
+            self.save_config(config)
     
     def _load_ai_config(self) -> Dict[str, Any]:
         """Load AI configuration from separate file."""
@@ -118,16 +208,26 @@ class ConfigManager:
             return {}
         
         try:
-            with open(ai_config_file, 'r') as file:
-                ai_config = yaml.safe_load(file) or {}
-                self.logger.info(f"Loaded AI configuration from {ai_config_file}")
-                return ai_config
+            ai_config = load_yaml(ai_config_file) or {}
+            self.logger.info(f"Loaded AI configuration from {ai_config_file}")
+            return ai_config
         except Exception as e:
             self.logger.error(f"Error loading AI config from {ai_config_file}: {e}")
             return {}
     
-    def get_ai_config(self) -> Dict[str, Any]:
-        """Get the AI configuration with provider-specific settings."""
+    def get_ai_config(self) -> Mapping[str, Any]:
+        """
+        Get a read-only view of the AI configuration with provider-specific settings.
+        
+        The merged result is cached until the config is saved or reloaded;
+        copy it with dict() to modify it.
+        """
+        if self._ai_config_merged is None:
+            self._ai_config_merged = _freeze(self._merge_ai_config())
+        return self._ai_config_merged
+    
+    def _merge_ai_config(self) -> Dict[str, Any]:
+        """Merge API keys with the settings of the currently selected AI provider."""
         if not self._ai_config:
             return {}
         
@@ -150,8 +250,13 @@ class ConfigManager:
     def reload_ai_config(self):
         """Reload AI configuration from file."""
         self._ai_config = self._load_ai_config()
+        self._ai_config_merged = None
+    
+    def set_ai_provider(self, provider: str):
+        """Set the AI provider and save to config."""
+        self._set_value(('ai', 'provider'), provider)
     
     @property
-    def config(self) -> Dict[str, Any]:
-        """Property to access the main configuration."""
-        return self._config
\ No newline at end of file
+    def config(self) -> Mapping[str, Any]:
+        """Property to access a read-only view of the main configuration."""
+        return self.get_config()
\ No newline at end of file
@@ -1,31 +1,110 @@
+import atexit
+import collections
 import logging
 import logging.handlers
 import os
-from typing import Optional
+import queue
+import threading
+from typing import List, Optional
 
 
-def setup_logging(name: str = "home_assistant", log_level: str = "INFO") -> logging.Logger:
-    """
-    Setup and return a logger instance using Python's standard logging.
+_log_queue: Optional[queue.Queue] = None
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_log_lock = threading.Lock()
+_buffered_handlers: list = []
+_flush_stop = threading.Event()
+
+# DEBUG/INFO records are written in batches; ERROR and above flush immediately
+_BUFFER_CAPACITY = 512
+_FLUSH_INTERVAL = 1.0  # seconds
+_RECENT_ERRORS = 1000
+_LOGS_DIR = "logs"
+_MAIN_LOG = "home_assistant.log"
+_ERROR_LOG = "home_assistant_error.log"
+# Set to 1 to also keep errors in their own rotating file
+PERSIST_ERRORS_ENV = "HA_PERSIST_ERRORS"
+# Directory for the log files instead of ./logs, e.g. a temp dir for tests
+LOGS_DIR_ENV = "HA_LOGS_DIR"
+
+
+class _BatchFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """Rotating file handler that leaves flushing to its _BufferedHandler."""
     
-    Args:
-        name: Logger name (e.g., "home_assistant.tts")
-        log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-        
-    Returns:
-        logging.Logger: Configured logger instance
-    """
-    logger = logging.getLogger(name)
+    def flush(self):
+        # Called after every record by StreamHandler.emit; the batch is flushed once instead
+        pass
     
-    # Prevent duplicate handlers
-    if logger.handlers:
-        return logger
+    def flush_batch(self):
+        """Push everything written so far to the file."""
+        super().flush()
+
+
+class _BufferedHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that hands a whole batch to its target and then flushes the file once."""
     
-    # Set log level
-    logger.setLevel(getattr(logging, log_level.upper()))
+    def flush(self):
+        self.acquire()
+        try:
+            super().flush()
+            if self.target:
+                self.target.flush_batch()
+        finally:
+            self.release()
+
+
+class _RingHandler(logging.Handler):
+    """Keep the most recent formatted records in a bounded in-memory buffer."""
     
-    # Create logs directory if it doesn't exist
-    logs_dir = "logs"
+    def __init__(self, capacity: int):
+        super().__init__()
+        self.records = collections.deque(maxlen=capacity)
+    
+    def emit(self, record):
+        try:
+            self.records.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+_error_ring = _RingHandler(_RECENT_ERRORS)
+
+
+def _buffered(target: _BatchFileHandler) -> _BufferedHandler:
+    """Wrap a file handler so its records are coalesced into batched writes."""
+    handler = _BufferedHandler(
+        capacity=_BUFFER_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=target,
+        flushOnClose=True
+    )
+    handler.setLevel(target.level)
+    _buffered_handlers.append(handler)
+    return handler
+
+
+def _flush_periodically():
+    """Flush buffered log records so quiet periods still reach the files promptly."""
+    while not _flush_stop.wait(_FLUSH_INTERVAL):
+        for handler in _buffered_handlers:
+            handler.flush()
+
+
+def _shutdown_logging():
+    """Drain the queue and write out any buffered records."""
+    _flush_stop.set()
+    if _log_listener is not None:
+        _log_listener.stop()
+    for handler in _buffered_handlers:
+        # MemoryHandler.close() flushes and then drops its target reference
+        target = handler.target
+        handler.close()
+        target.close()
+
+
+def _create_handlers() -> list:
+    """Create the console, rotating file and recent-error handlers shared by all loggers."""
+    # Create logs directory if it doesn't exist; runs once, when the shared listener starts
+    logs_dir = os.environ.get(LOGS_DIR_ENV) or _LOGS_DIR
     os.makedirs(logs_dir, exist_ok=True)
     
     # Create formatters
@@ -40,31 +119,97 @@ def setup_logging(name: str = "home_assistant", log_level: str = "INFO") -> logg
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(simple_formatter)
-    logger.addHandler(console_handler)
     
     # File handler with daily rotation (DEBUG and above)
-    file_handler = logging.handlers.TimedRotatingFileHandler(
-        filename=os.path.join(logs_dir, "home_assistant.log"),
+    file_handler = _BatchFileHandler(
+        filename=os.path.join(logs_dir, _MAIN_LOG),
         when="midnight",
         interval=1,
         backupCount=30,  # Keep 30 days of logs
-        encoding="utf-8"
+        encoding="utf-8",
+        delay=True  # Open the file on the first record rather than at startup
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(detailed_formatter)
-    logger.addHandler(file_handler)
     
-    # Error file handler (ERROR and above)
-    error_handler = logging.handlers.TimedRotatingFileHandler(
-        filename=os.path.join(logs_dir, "home_assistant_error.log"),
-        when="midnight",
-        interval=1,
-        backupCount=30,
-        encoding="utf-8"
-    )
-    error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(detailed_formatter)
-    logger.addHandler(error_handler)
+    # Recent errors stay in memory; home_assistant.log already has every record
+    _error_ring.setLevel(logging.ERROR)
+    _error_ring.setFormatter(detailed_formatter)
+    handlers = [console_handler, _buffered(file_handler), _error_ring]
+    
+    # Error file handler (ERROR and above), only when requested
+    if os.environ.get(PERSIST_ERRORS_ENV) == "1":
+        error_handler = _BatchFileHandler(
+            filename=os.path.join(logs_dir, _ERROR_LOG),
+            when="midnight",
+            interval=1,
+            backupCount=30,
+            encoding="utf-8",
+            delay=True
+        )
+        error_handler.setLevel(logging.ERROR)
+        error_handler.setFormatter(detailed_formatter)
+        handlers.append(_buffered(error_handler))
+    
+    return handlers
+
+
+def _get_log_queue() -> queue.Queue:
+    """
+    Get the queue feeding the shared log listener, starting the listener on first use.
+    
+    A single QueueListener thread owns the console and file handlers, so only one
+    handler ever writes to each log file and callers never block on formatting or I/O.
+    """
+    global _log_queue, _log_listener
+    # Double-checked: after startup the queue is returned without taking the lock
+    if _log_listener is not None:
+        return _log_queue
+    with _log_lock:
+        if _log_listener is None:
+            _log_queue = queue.Queue(-1)
+            _log_listener = logging.handlers.QueueListener(
+                _log_queue, *_create_handlers(), respect_handler_level=True
+            )
+            _log_listener.start()
+            threading.Thread(target=_flush_periodically, name="log-flush", daemon=True).start()
+            # Drain queued and buffered records on shutdown
+            atexit.register(_shutdown_logging)
+        return _log_queue
+
+
+def setup_logging(name: str = "home_assistant", log_level: str = "INFO") -> logging.Logger:
+    """
+    Setup and return a logger instance using Python's standard logging.
+    
+    In per-frame or per-utterance code pass arguments lazily, e.g.
+    logger.debug("score: %.2f", score), rather than with an f-string: the
+    message is then only formatted if the level is enabled.
+    
+    Args:
+        name: Logger name (e.g., "home_assistant.tts")
+        log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        
+    Returns:
+        logging.Logger: Configured logger instance
+    """
+    logger = logging.getLogger(name)
+    
+    # Prevent duplicate handlers
+    if logger.handlers:
+        return logger
+    
+    log_queue = _get_log_queue()
+    with _log_lock:
+        # Re-check under the lock so threads racing to set up the same logger attach one handler
+        if logger.handlers:
+            return logger
+        
+        # Set log level
+        logger.setLevel(getattr(logging, log_level.upper()))
+        
+        # Records are only enqueued here; formatting and file writes happen on the listener thread
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
     
     return logger
 
@@ -79,4 +224,14 @@ def get_logger(name: str = "home_assistant") -> logging.Logger:
     Returns:
         logging.Logger: Logger instance
     """
-    return logging.getLogger(name) 
\ No newline at end of file
+    return logging.getLogger(name)
+
+
+def get_recent_errors() -> List[str]:
+    """
+    Get the most recent ERROR and CRITICAL log records, oldest first.
+    
+    Returns:
+        List[str]: Formatted records, at most the last 1000
+    """
+    return list(_error_ring.records)
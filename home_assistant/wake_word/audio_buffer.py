@@ -0,0 +1,155 @@
+"""
+Audio Ring Buffer
+
+Single-producer/single-consumer ring buffer used to hand audio frames from the
+PortAudio callback thread to the wake word detection loop.
+"""
+
+import threading
+from typing import Optional
+
+import numpy as np
+
+
+def pcm_view(buf, frame_length: Optional[int] = None) -> np.ndarray:
+    """
+    View raw int16 PCM bytes as a NumPy array without copying.
+
+    Use this instead of struct.unpack, which builds a Python tuple per frame.
+
+    Args:
+        buf: Bytes-like object holding int16 samples
+        frame_length: Expected number of samples, checked if given
+
+    Returns:
+        np.ndarray: Read-only int16 view of buf
+
+    Raises:
+        ValueError: If buf does not hold exactly frame_length samples
+    """
+    if frame_length is not None and len(buf) != frame_length * 2:
+        raise ValueError(f"Expected {frame_length * 2} bytes of PCM, got: {len(buf)}")
+    return np.frombuffer(buf, dtype=np.int16)
+
+
+class AudioRingBuffer:
+    """
+    Preallocated ring buffer of fixed-size int16 audio frames.
+
+    The producer (audio callback) only advances the head counter and the consumer
+    (detection loop) only advances the tail counter. Under the GIL these integer
+    updates are atomic, so the data handoff needs no lock; the event is only used
+    to let the consumer block while the buffer is empty, and the producer only
+    signals it when the consumer is actually waiting. While the consumer keeps up
+    or drains a backlog, frames are exchanged without any synchronization.
+    """
+
+    def __init__(self, frame_size: int, capacity: int = 64):
+        """
+        Initialize the ring buffer.
+
+        Args:
+            frame_size: Number of int16 samples per frame
+            capacity: Number of frame slots, must be a power of two
+        """
+        if capacity < 2 or capacity & (capacity - 1):
+            raise ValueError(f"Ring buffer capacity must be a power of two >= 2, got: {capacity}")
+
+        self.frame_size = frame_size
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self._frames = np.zeros((capacity, frame_size), dtype=np.int16)
+        # Byte views of each slot so incoming buffers are copied with a plain memcpy
+        self._frame_bytes = frame_size * self._frames.itemsize
+        self._slot_views = [memoryview(slot).cast('B') for slot in self._frames]
+
+        self._head = 0  # Written by producer only
+        self._tail = 0  # Written by consumer only
+        self._data_ready = threading.Event()
+        self._consumer_waiting = False
+
+        self.overflows = 0
+
+    @classmethod
+    def with_min_bytes(cls, frame_size: int, min_bytes: int) -> 'AudioRingBuffer':
+        """
+        Create a ring buffer holding at least min_bytes of audio.
+
+        Args:
+            frame_size: Number of int16 samples per frame
+            min_bytes: Minimum size of the backing array in bytes
+
+        Returns:
+            AudioRingBuffer: Buffer with the smallest power-of-two capacity that fits
+        """
+        frames = -(-min_bytes // (frame_size * np.dtype(np.int16).itemsize))
+        capacity = 1 << max(1, (frames - 1).bit_length())
+        return cls(frame_size, capacity)
+
+    @property
+    def available(self) -> int:
+        """Number of frames waiting to be read."""
+        return self._head - self._tail
+
+    def write(self, data) -> bool:
+        """
+        Copy one frame of int16 PCM data into the buffer (producer thread only).
+
+        Args:
+            data: Bytes-like object (bytes, CFFI buffer, ndarray) holding up to frame_size int16 samples
+
+        Returns:
+            bool: True if the frame was stored, False if the buffer was full and it was dropped
+        """
+        # One slot stays reserved for the frame the consumer is currently reading
+        if self._head - self._tail >= self._mask:
+            self.overflows += 1
+            return False
+
+        index = self._head & self._mask
+        source = memoryview(data).cast('B')
+        if source.nbytes == self._frame_bytes:
+            self._slot_views[index][:] = source
+        else:
+            count = min(source.nbytes, self._frame_bytes) & ~1
+            self._slot_views[index][:count] = source[:count]
+            self._frames[index][count // 2:] = 0
+
+        self._head += 1
+        if self._consumer_waiting:
+            self._data_ready.set()
+        return True
+
+    def read(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Get the next frame (consumer thread only).
+
+        The returned array is a view into the buffer and stays valid until the next call to read().
+
+        Args:
+            timeout: Seconds to wait for a frame (None waits indefinitely)
+
+        Returns:
+            Optional[np.ndarray]: The next int16 frame, or None if none arrived before the timeout
+        """
+        if self._head == self._tail:
+            self._data_ready.clear()
+            self._consumer_waiting = True
+            # Re-check after announcing the wait so a write in between isn't missed
+            try:
+                if self._head == self._tail and not self._data_ready.wait(timeout):
+                    return None
+            finally:
+                self._consumer_waiting = False
+
+        frame = self._frames[self._tail & self._mask]
+        self._tail += 1
+        return frame
+
+    def reset(self):
+        """Discard all buffered frames. Only call while the producer is stopped."""
+        self._head = 0
+        self._tail = 0
+        self.overflows = 0
+        self._consumer_waiting = False
+        self._data_ready.clear()
@@ -8,6 +8,7 @@ Follows the same pattern as BaseSpeechProvider for consistency.
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, Tuple
 import logging
+import os
 
 
 class WakeWordConfigurationError(Exception):
@@ -130,4 +131,47 @@ class BaseWakeWordProvider(ABC):
             Optional[list]: List of supported wake words, or None if custom words are supported
         """
         # Default implementation - providers can override
-        return None
\ No newline at end of file
+        return None
+    
+    def _apply_detection_scheduling(self) -> Optional[Tuple]:
+        """
+        Pin the calling thread and raise its priority for the detection loop (Linux only).
+        
+        Uses the optional config keys cpu_affinity (list of CPU ids) and rt_priority
+        (SCHED_FIFO priority, 1-99). Failures, e.g. missing privileges for real-time
+        scheduling, are logged and detection continues with default scheduling.
+        
+        Returns:
+            Optional[Tuple]: Previous (affinity, policy, param) to pass to
+                _restore_detection_scheduling, or None if nothing was changed
+        """
+        cpu_affinity = self.config.get('cpu_affinity')
+        rt_priority = self.config.get('rt_priority')
+        if not (cpu_affinity or rt_priority) or not hasattr(os, 'sched_setaffinity'):
+            return None
+        
+        # pid 0 applies to the calling thread only
+        previous = (os.sched_getaffinity(0), os.sched_getscheduler(0), os.sched_getparam(0))
+        if cpu_affinity:
+            try:
+                os.sched_setaffinity(0, cpu_affinity)
+            except OSError as e:
+                self.logger.warning(f"Could not pin detection thread to CPUs {cpu_affinity}: {e}")
+        if rt_priority:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(rt_priority))
+            except OSError as e:
+                self.logger.warning(f"Could not set real-time priority {rt_priority} for detection thread: {e}")
+        return previous
+    
+    def _restore_detection_scheduling(self, previous: Optional[Tuple]):
+        """Undo _apply_detection_scheduling once the detection loop has finished."""
+        if previous is None:
+            return
+        
+        affinity, policy, param = previous
+        try:
+            os.sched_setscheduler(0, policy, param)
+            os.sched_setaffinity(0, affinity)
+        except OSError as e:
+            self.logger.warning(f"Could not restore detection thread scheduling: {e}")
@@ -5,13 +5,41 @@ Factory-based wake word detector that follows the same pattern as SpeechRecogniz
 Supports multiple wake word detection providers with single provider operation.
 """
 
-from typing import Dict, Any, Optional, Tuple
+from typing import Callable, ClassVar, Dict, Any, Optional, Tuple, Type
 import logging
+import os
+import time
 
 from .base_wake_word_provider import BaseWakeWordProvider, WakeWordConfigurationError, WakeWordProviderUnavailableError
 from ..utils.config import ConfigManager
 
 
+def _load_openwakeword() -> Type[BaseWakeWordProvider]:
+    from .providers.openwakeword_provider import OpenWakeWordProvider
+    return OpenWakeWordProvider
+
+
+def _load_porcupine() -> Type[BaseWakeWordProvider]:
+    from .providers.porcupine_provider import PorcupineProvider
+    return PorcupineProvider
+
+
+def _load_pocketsphinx() -> Type[BaseWakeWordProvider]:
+    from .providers.pocketsphinx_provider import PocketSphinxProvider
+    return PocketSphinxProvider
+
+
+# Provider modules are only imported when first requested
+_PROVIDER_REGISTRY: Dict[str, Callable[[], Type[BaseWakeWordProvider]]] = {
+    'openwakeword': _load_openwakeword,
+    'porcupine': _load_porcupine,
+    'pocketsphinx': _load_pocketsphinx,
+}
+_PROVIDER_CLASS_CACHE: Dict[str, Type[BaseWakeWordProvider]] = {}
+# Re-check providers periodically: a dependency may be installed or a device plugged in
+_AVAILABILITY_TTL = 30.0
+
+
 class WakeWordDetector:
     """
     Factory-based wake word detector that manages different wake word detection providers.
@@ -20,6 +48,9 @@ class WakeWordDetector:
     wake word detection providers based on configuration.
     """
     
+    # Latest availability per provider as (config file mtime, checked at, available), shared process-wide
+    _availability_cache: ClassVar[Dict[str, Tuple[float, float, bool]]] = {}
+    
     def __init__(self, provider_name: Optional[str] = None):
         """
         Initialize the wake word detector with a specific provider.
@@ -29,20 +60,37 @@ class WakeWordDetector:
         """
         self.logger = logging.getLogger("home_assistant.wake_word.detector")
         self.config_manager = ConfigManager()
+        self._requested_provider = provider_name
         
-        # Determine provider name
-        if provider_name:
-            self.provider_name = provider_name
-        else:
-            wake_word_config = self.config_manager.get_config().get('wake_word', {})
-            detection_config = wake_word_config.get('detection', {})
-            self.provider_name = detection_config.get('provider', 'openwakeword')
+        self._snapshot_config()
         
         # Create the provider
         self.provider = self._create_provider()
         
         self.logger.info(f"Wake word detector initialized with provider: {self.provider_name}")
     
+    def _snapshot_config(self):
+        """Read the wake word settings once so listening doesn't go back to the config manager."""
+        self._wake_word_cfg = self.config_manager.get_config().get('wake_word', {})
+        self._default_wake_word = self._wake_word_cfg.get('name')
+        
+        # Determine provider name
+        if self._requested_provider:
+            self.provider_name = self._requested_provider
+        else:
+            detection_config = self._wake_word_cfg.get('detection', {})
+            self.provider_name = detection_config.get('provider', 'openwakeword')
+    
+    def reload_config(self):
+        """
+        Re-read the configuration file and recreate the provider from the new settings.
+        """
+        self.cleanup()
+        self.config_manager = ConfigManager(self.config_manager.config_path)
+        self._snapshot_config()
+        self.provider = self._create_provider()
+        self.logger.info(f"Wake word detector reloaded with provider: {self.provider_name}")
+    
     def _create_provider(self) -> BaseWakeWordProvider:
         """
         Create the wake word provider based on the configured provider name.
@@ -54,29 +102,25 @@ class WakeWordDetector:
             WakeWordConfigurationError: If the provider is unknown or configuration is invalid
         """
         # Get provider-specific configuration
-        wake_word_config = self.config_manager.get_config().get('wake_word', {})
-        detection_config = wake_word_config.get('detection', {})
+        detection_config = self._wake_word_cfg.get('detection', {})
         providers_config = detection_config.get('providers', {})
-        provider_config = providers_config.get(self.provider_name, {})
+        provider_config = dict(providers_config.get(self.provider_name) or {})
         
         # Add common configuration
         provider_config['provider_name'] = self.provider_name
         
+        loader = _PROVIDER_REGISTRY.get(self.provider_name)
+        if loader is None:
+            raise WakeWordConfigurationError(
+                f"Unknown wake word provider '{self.provider_name}'. "
+                f"Valid options: {', '.join(_PROVIDER_REGISTRY)}"
+            )
+        
         try:
-            if self.provider_name == 'openwakeword':
-                from .providers.openwakeword_provider import OpenWakeWordProvider
-                return OpenWakeWordProvider(provider_config)
-            elif self.provider_name == 'porcupine':
-                from .providers.porcupine_provider import PorcupineProvider
-                return PorcupineProvider(provider_config)
-            elif self.provider_name == 'pocketsphinx':
-                from .providers.pocketsphinx_provider import PocketSphinxProvider
-                return PocketSphinxProvider(provider_config)
-            else:
-                raise WakeWordConfigurationError(
-                    f"Unknown wake word provider '{self.provider_name}'. "
-                    f"Valid options: openwakeword, porcupine, pocketsphinx"
-                )
+            provider_class = _PROVIDER_CLASS_CACHE.get(self.provider_name)
+            if provider_class is None:
+                provider_class = _PROVIDER_CLASS_CACHE.setdefault(self.provider_name, loader())
+            return provider_class(provider_config)
         except ImportError as e:
             raise WakeWordProviderUnavailableError(
                 f"Wake word provider '{self.provider_name}' is not available. "
@@ -102,7 +146,7 @@ class WakeWordDetector:
         
         # Get wake word from config if not provided
         if wake_word is None:
-            wake_word = self.config_manager.get_wake_word()
+            wake_word = self._default_wake_word
             if not wake_word:
                 self.logger.error("No wake word configured")
                 return False, 0.0
@@ -113,7 +157,7 @@ class WakeWordDetector:
             return False, 0.0
         
         try:
-            self.logger.debug(f"Listening for wake word: '{wake_word}' with timeout: {timeout}")
+            self.logger.debug("Listening for wake word: '%s' with timeout: %s", wake_word, timeout)
             return self.provider.listen_for_wake_word(wake_word, timeout)
         except Exception as e:
             self.logger.error(f"Error during wake word detection: {e}")
@@ -158,15 +202,27 @@ class WakeWordDetector:
             Dict[str, bool]: Dictionary mapping provider names to availability status
         """
         providers = {}
-        provider_list = ['openwakeword', 'porcupine', 'pocketsphinx']
+        provider_list = list(_PROVIDER_REGISTRY)
+        
+        # Cached results stay valid until the config file changes or they expire
+        try:
+            config_mtime = os.path.getmtime(self.config_manager.config_path)
+        except OSError:
+            config_mtime = 0.0
         
         for provider_name in provider_list:
-            try:
-                # Try to create a temporary instance to check availability
-                temp_detector = WakeWordDetector(provider_name)
-                providers[provider_name] = temp_detector.is_available()
-            except:
-                providers[provider_name] = False
+            now = time.monotonic()
+            cached = self._availability_cache.get(provider_name)
+            if cached is None or cached[0] != config_mtime or now - cached[1] >= _AVAILABILITY_TTL:
+                try:
+                    # Try to create a temporary instance to check availability
+                    temp_detector = WakeWordDetector(provider_name)
+                    available = temp_detector.is_available()
+                except:
+                    available = False
+                cached = (config_mtime, now, available)
+                self._availability_cache[provider_name] = cached
+            providers[provider_name] = cached[2]
         
         return providers
     
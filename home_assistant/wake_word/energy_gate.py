@@ -0,0 +1,115 @@
+"""
+Energy Gate
+
+Cheap RMS-based voice activity gate used to skip wake word decoding on silent audio.
+"""
+
+import math
+from typing import Optional
+
+import numpy as np
+
+from .audio_buffer import pcm_view
+
+
+def spectral_flatness(pcm, n_fft: int = 256) -> float:
+    """
+    Estimate how noise-like a frame of int16 PCM is.
+
+    The frame is split into n_fft-sample blocks and the flatness (geometric over
+    arithmetic mean) of their averaged power spectrum is returned. Values near 1
+    mean a flat, noise-like spectrum; voiced speech has a peaky spectrum and
+    scores much lower.
+
+    Args:
+        pcm: int16 samples, as an array or raw PCM bytes
+        n_fft: FFT size per block
+
+    Returns:
+        float: Spectral flatness in [0, 1]
+    """
+    if not isinstance(pcm, np.ndarray):
+        pcm = pcm_view(pcm)
+    blocks = len(pcm) // n_fft
+    if blocks == 0:
+        return 0.0
+    frames = pcm[:blocks * n_fft].reshape(blocks, n_fft).astype(np.float32)
+    power = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+    power = power.mean(axis=0) + 1e-10
+    return float(np.exp(np.log(power).mean()) / power.mean())
+
+
+class EnergyGate:
+    """
+    Adaptive energy gate that tracks the background noise floor.
+
+    A frame is considered active when its RMS exceeds the noise floor by the
+    configured margin. The noise floor is an exponential moving average of the
+    RMS of inactive frames, and a short hangover keeps the gate open after speech
+    so the tail of a wake word still reaches the decoder.
+    """
+
+    def __init__(self, margin: float = 3.0, hangover_frames: int = 15,
+                 warmup_frames: int = 30, alpha: float = 0.05, min_floor: float = 50.0):
+        """
+        Initialize the energy gate.
+
+        Args:
+            margin: Factor above the noise floor that counts as activity
+            hangover_frames: Frames to keep the gate open after activity ends
+            warmup_frames: Frames passed through unconditionally while learning the noise floor
+            alpha: Smoothing factor for the noise floor moving average
+            min_floor: Lower bound for the noise floor (int16 RMS units)
+        """
+        self.margin = margin
+        self.hangover_frames = hangover_frames
+        self.warmup_frames = warmup_frames
+        self.alpha = alpha
+        self.min_floor = min_floor
+
+        self.noise_floor = min_floor
+        self._frames_seen = 0
+        self._hangover = 0
+        self._scratch: Optional[np.ndarray] = None
+
+    def reset(self):
+        """Forget the learned noise floor, e.g. when a new listening session starts."""
+        self.noise_floor = self.min_floor
+        self._frames_seen = 0
+        self._hangover = 0
+
+    def is_active(self, pcm) -> bool:
+        """
+        Check whether a frame of int16 PCM should be decoded.
+
+        Args:
+            pcm: int16 samples for one frame, as an array or raw PCM bytes
+
+        Returns:
+            bool: True if the frame may contain speech
+        """
+        if not isinstance(pcm, np.ndarray):
+            pcm = pcm_view(pcm)
+        if self._scratch is None or len(self._scratch) != len(pcm):
+            self._scratch = np.empty(len(pcm), dtype=np.float32)
+        np.copyto(self._scratch, pcm, casting='unsafe')
+        rms = math.sqrt(float(np.dot(self._scratch, self._scratch)) / len(pcm))
+
+        if self._frames_seen < self.warmup_frames:
+            self._frames_seen += 1
+            self._update_floor(rms)
+            return True
+
+        if rms > self.noise_floor * self.margin:
+            self._hangover = self.hangover_frames
+            return True
+
+        self._update_floor(rms)
+        if self._hangover > 0:
+            self._hangover -= 1
+            return True
+        return False
+
+    def _update_floor(self, rms: float):
+        """Fold a quiet frame's RMS into the noise floor estimate."""
+        self.noise_floor = max(self.min_floor, (1.0 - self.alpha) * self.noise_floor + self.alpha * rms)
@@ -6,13 +6,31 @@ This is the default provider offering custom wake word training and offline oper
 """
 
 import os
+import re
 import sys
 import numpy as np
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional
 import threading
 import time
 
 from ..base_wake_word_provider import BaseWakeWordProvider, WakeWordConfigurationError, WakeWordProviderUnavailableError
+from ..audio_buffer import AudioRingBuffer
+
+
+# Feature-extraction models shipped alongside wake word models
+_EXCLUDED_PREFIXES = ('embedding_', 'melspectrogram', 'silero_')
+
+# 1-4 whitespace separated words of 2-15 characters each
+_WAKE_WORD_RE = re.compile(r'^\S{2,15}(?:\s+\S{2,15}){0,3}$')
+
+# Default capture ring buffer size
+_RING_BUFFER_BYTES = 1 << 20
+
+# Seconds an availability probe result is reused before probing again
+_AVAILABILITY_TTL = 30.0
+
+# Loaded models shared by all provider instances, keyed by (model files, inference framework)
+_MODEL_CACHE: Dict[Tuple[Tuple[str, ...], str], Any] = {}
 
 
 class OpenWakeWordProvider(BaseWakeWordProvider):
@@ -32,25 +50,50 @@ class OpenWakeWordProvider(BaseWakeWordProvider):
                 - model_path: Path to OpenWakeWord models directory
                 - threshold: Detection threshold (0.0-1.0, default 0.5)
                 - inference_framework: Framework to use ('onnx' or 'tflite', default 'onnx')
+                - ring_buffer_frames: Audio frames buffered between capture and inference
+                  (power of two, default: enough for 1 MB, about 40 s of audio)
+                - frames_per_predict: 80 ms frames batched into each model call (default 2)
+                - audio_backend: Capture library, 'pyaudio' (default) or 'sounddevice'
+                - inference_cpus: Optional list of CPU ids to pin the inference thread to (Linux only)
         """
         super().__init__(config)
         
         self.model_path = config.get('model_path', './openwakeword_models')
         self.threshold = config.get('threshold', 0.5)
         self.inference_framework = config.get('inference_framework', 'onnx')
+        self._model_extension = '.tflite' if self.inference_framework == 'tflite' else '.onnx'
         
         # OpenWakeWord components (initialized lazily)
         self.oww_model = None
+        self._model_files: Optional[List[str]] = None
         self.audio_format = None
         
         # Audio processing
         self.sample_rate = 16000
-        self.chunk_size = 1024
+        self.chunk_size = 1280  # 80 ms, OpenWakeWord's native frame size
+        self.frames_per_predict = max(1, int(config.get('frames_per_predict', 2)))
         self.channels = 1
+        self.ring_buffer_frames = config.get('ring_buffer_frames')
+        self.audio_backend = config.get('audio_backend', 'pyaudio')
+        self.input_overflows = 0
+        self._ring = None
+        self._float_scratch = None
+        self._float_slots = None
+        self._scale = np.float32(1.0 / 32768.0)  # int16 full scale -> [-1.0, 1.0)
+        self._pa_continue = None
+        
+        # Detection scoring (model names are stable once the model is loaded)
+        self._model_names = None
+        self._scores = None
         
         # State management
         self._stop_listening = False
         self._listening_thread = None
+        self._detected = threading.Event()
+        self._detected_score = 0.0
+        self.inference_cpus = config.get('inference_cpus')
+        self._availability_cached: Optional[bool] = None
+        self._availability_ts = 0.0
         
         self.logger.debug(f"OpenWakeWord provider initialized with model_path: {self.model_path}")
     
@@ -63,38 +106,39 @@ class OpenWakeWordProvider(BaseWakeWordProvider):
             import openwakeword
             from openwakeword import Model
             
-            # Initialize the model with proper file paths
+            # Resolve which model files to load (None means all pre-trained models)
+            wake_word_models = None
             if os.path.isdir(self.model_path):
                 # Load specific wake word models from directory
-                wake_word_models = []
-                model_extension = '.onnx' if self.inference_framework == 'onnx' else '.tflite'
-                
-                for filename in os.listdir(self.model_path):
-                    if (filename.endswith(model_extension) and 
-                        not filename.startswith(('embedding_', 'melspectrogram', 'silero_'))):
-                        wake_word_models.append(os.path.join(self.model_path, filename))
-                
-                if wake_word_models:
-                    self.logger.debug(f"Loading wake word models: {wake_word_models}")
-                    self.oww_model = Model(
-                        wakeword_models=wake_word_models,
-                        inference_framework=self.inference_framework
-                    )
-                else:
+                wake_word_models = [os.path.join(self.model_path, filename) for filename in self._scan_models()]
+                if not wake_word_models:
                     # Fallback: load all available pre-trained models
                     self.logger.debug("No specific models found, loading all pre-trained models")
-                    self.oww_model = Model(inference_framework=self.inference_framework)
-                    
+                    wake_word_models = None
             elif os.path.isfile(self.model_path):
                 # Single model file
+                wake_word_models = [self.model_path]
+            else:
+                # Default: load all available pre-trained models
+                self.logger.debug("Model path not found, using default pre-trained models")
+            
+            cache_key = (tuple(sorted(wake_word_models or ())), self.inference_framework)
+            self.oww_model = _MODEL_CACHE.get(cache_key)
+            if self.oww_model is not None:
+                # Clear streaming state left over from the previous owner
+                self.oww_model.reset()
+                self.logger.debug("Reusing cached OpenWakeWord model for: %s", self.model_path)
+                return
+            
+            if wake_word_models:
+                self.logger.debug(f"Loading wake word models: {wake_word_models}")
                 self.oww_model = Model(
-                    wakeword_models=[self.model_path],
+                    wakeword_models=wake_word_models,
                     inference_framework=self.inference_framework
                 )
             else:
-                # Default: load all available pre-trained models
-                self.logger.debug("Model path not found, using default pre-trained models")
                 self.oww_model = Model(inference_framework=self.inference_framework)
+            _MODEL_CACHE[cache_key] = self.oww_model
             
             self.logger.info(f"OpenWakeWord model loaded with {self.inference_framework} framework from: {self.model_path}")
             
@@ -107,18 +151,127 @@ class OpenWakeWordProvider(BaseWakeWordProvider):
                 f"Failed to initialize OpenWakeWord model: {e}"
             )
     
+    def _scan_models(self) -> List[str]:
+        """
+        Get the wake word model filenames in the model directory.
+        
+        The directory is scanned once and the result reused until reload_models() is called.
+        
+        Returns:
+            List[str]: Model filenames, excluding feature-extraction models
+        """
+        if self._model_files is None:
+            model_extension = self._model_extension
+            with os.scandir(self.model_path) as entries:
+                self._model_files = sorted(
+                    entry.name for entry in entries
+                    if (entry.is_file() and entry.name.endswith(model_extension) and
+                        not entry.name.startswith(_EXCLUDED_PREFIXES))
+                )
+        return self._model_files
+    
+    def reload_models(self):
+        """Forget the cached model directory scan so new model files are picked up."""
+        self._model_files = None
+        self.oww_model = None
+        self._model_names = None
+        self._scores = None
+    
     def _setup_audio(self):
         """Set up audio recording for wake word detection."""
-        try:
-            import pyaudio
-            
-            self.audio_format = pyaudio.paInt16
-            self.logger.debug("Audio setup complete")
+        if self.audio_backend == 'sounddevice':
+            try:
+                import sounddevice
+            except ImportError:
+                raise WakeWordProviderUnavailableError(
+                    "sounddevice not available. Install with: pip install sounddevice"
+                )
+        else:
+            try:
+                import pyaudio
+                
+                self.audio_format = pyaudio.paInt16
+                self._pa_continue = pyaudio.paContinue
+                
+            except ImportError:
+                raise WakeWordProviderUnavailableError(
+                    "PyAudio not available. Install with: pip install pyaudio"
+                )
+        
+        if self._ring is None:
+            if self.ring_buffer_frames:
+                self._ring = AudioRingBuffer(self.chunk_size, self.ring_buffer_frames)
+            else:
+                # Large enough to ride out long inference stalls without dropping audio
+                self._ring = AudioRingBuffer.with_min_bytes(self.chunk_size, _RING_BUFFER_BYTES)
+            # Reused for every frame so the hot loop doesn't allocate
+            self._float_scratch = np.empty(self.chunk_size * self.frames_per_predict, dtype=np.float32)
+            self._float_slots = [
+                self._float_scratch[i * self.chunk_size:(i + 1) * self.chunk_size]
+                for i in range(self.frames_per_predict)
+            ]
+        else:
+            self._ring.reset()
+        self.input_overflows = 0
+        
+        self.logger.debug("Audio setup complete (%s)", self.audio_backend)
+    
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """PyAudio stream callback: push captured frames into the ring buffer."""
+        self._ring.write(in_data)
+        return None, self._pa_continue
+    
+    def _sd_audio_callback(self, indata, frames, time_info, status):
+        """sounddevice stream callback: copy the CFFI buffer straight into the ring buffer."""
+        if status.input_overflow:
+            self.input_overflows += 1
+        self._ring.write(indata)
+    
+    def _open_stream(self):
+        """
+        Open and start the capture stream for the configured backend.
+        
+        Capture runs on the PortAudio thread and feeds the ring buffer.
+        
+        Returns:
+            Callable that stops and closes the stream
+        """
+        if self.audio_backend == 'sounddevice':
+            import sounddevice as sd
             
-        except ImportError:
-            raise WakeWordProviderUnavailableError(
-                "PyAudio not available. Install with: pip install pyaudio"
+            stream = sd.RawInputStream(
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                dtype='int16',
+                blocksize=self.chunk_size,
+                callback=self._sd_audio_callback
             )
+            stream.start()
+            
+            def close_stream():
+                stream.stop()
+                stream.close()
+            
+            return close_stream
+        
+        import pyaudio
+        
+        audio = pyaudio.PyAudio()
+        stream = audio.open(
+            format=self.audio_format,
+            channels=self.channels,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=self.chunk_size,
+            stream_callback=self._audio_callback
+        )
+        
+        def close_stream():
+            stream.stop_stream()
+            stream.close()
+            audio.terminate()
+        
+        return close_stream
     
     def listen_for_wake_word(self, wake_word: str, timeout: Optional[int] = None) -> Tuple[bool, float]:
         """
@@ -138,72 +291,126 @@ class OpenWakeWordProvider(BaseWakeWordProvider):
         self._setup_audio()
         
         try:
-            import pyaudio
+            close_stream = self._open_stream()
             
-            # Create audio stream
-            audio = pyaudio.PyAudio()
-            stream = audio.open(
-                format=self.audio_format,
-                channels=self.channels,
-                rate=self.sample_rate,
-                input=True,
-                frames_per_buffer=self.chunk_size
+            # Inference runs on its own thread so ONNX Runtime (which releases the GIL)
+            # overlaps with audio marshaling; this thread only waits for the outcome
+            self._stop_listening = False
+            self._detected.clear()
+            self._listening_thread = threading.Thread(
+                target=self._inference_loop, name="openwakeword-inference", daemon=True
             )
             
-            self.logger.info(f"Listening for wake word: '{wake_word}'")
-            start_time = time.time()
+            self.logger.info("Listening for wake word: '%s'", wake_word)
+            deadline = (time.monotonic() + timeout) if timeout else None
+            self._listening_thread.start()
             
             try:
-                while True:
-                    # Check timeout
-                    if timeout and time.time() - start_time > timeout:
+                # Wait in short slices so KeyboardInterrupt is still delivered promptly
+                while not self._detected.wait(timeout=0.1):
+                    if deadline is not None and time.monotonic() > deadline:
                         self.logger.debug("Wake word detection timed out")
                         return False, 0.0
-                    
-                    # Read audio data
-                    try:
-                        audio_data = stream.read(self.chunk_size, exception_on_overflow=False)
-                        audio_array = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
-                        
-                        # Get predictions from OpenWakeWord
-                        prediction = self.oww_model.predict(audio_array)
-                        
-                        # Check for wake word detection
-                        for model_name, score in prediction.items():
-                            if score > self.threshold:
-                                self.logger.info(f"Wake word detected! Model: {model_name}, Score: {score:.3f}")
-                                return True, float(score)
-                    
-                    except Exception as e:
-                        self.logger.warning(f"Error processing audio chunk: {e}")
-                        continue
-                    
+                
+                return True, self._detected_score
+                
             finally:
+                self._stop_listening = True
+                self._listening_thread.join(timeout=1.0)
+                
                 # Clean up audio resources
-                stream.stop_stream()
-                stream.close()
-                audio.terminate()
+                close_stream()
+                
+                if self._ring.overflows:
+                    self.logger.warning("Dropped %d audio frames while inference was behind", self._ring.overflows)
+                if self.input_overflows:
+                    self.logger.warning("Audio input overflowed %d times", self.input_overflows)
                 
         except KeyboardInterrupt:
             self.logger.info("Wake word detection interrupted by user")
             return False, 0.0
         except Exception as e:
             self.logger.error(f"Error during wake word detection: {e}")
+            self._availability_cached = None
             raise WakeWordProviderUnavailableError(f"Wake word detection failed: {e}")
     
+    def _inference_loop(self):
+        """Drain the ring buffer and run the model until detection or stop is requested."""
+        if self.inference_cpus and hasattr(os, 'sched_setaffinity'):
+            try:
+                # pid 0 applies to the calling thread only
+                os.sched_setaffinity(0, self.inference_cpus)
+            except OSError as e:
+                self.logger.warning(f"Could not pin inference thread to CPUs {self.inference_cpus}: {e}")
+        
+        batched = 0
+        while not self._stop_listening:
+            # Wait briefly for the next frame so stop requests are still noticed while idle
+            frame = self._ring.read(timeout=0.1)
+            if frame is None:
+                continue
+            
+            try:
+                np.multiply(frame, self._scale, out=self._float_slots[batched], dtype=np.float32, casting='unsafe')
+                batched += 1
+                if batched < self.frames_per_predict:
+                    continue
+                batched = 0
+                
+                # Get predictions from OpenWakeWord for the whole batch
+                prediction = self.oww_model.predict(self._float_scratch)
+                
+                if self._model_names is None:
+                    self._model_names = tuple(prediction.keys())
+                    self._scores = np.empty(len(self._model_names), dtype=np.float32)
+                
+                # Check for wake word detection; the common negative case stops at max()
+                for i, model_name in enumerate(self._model_names):
+                    self._scores[i] = prediction[model_name]
+                if self._scores.max() <= self.threshold:
+                    continue
+                
+                best = int(self._scores.argmax())
+                score = float(self._scores[best])
+                self.logger.info("Wake word detected! Model: %s, Score: %.3f", self._model_names[best], score)
+                self._detected_score = score
+                self._detected.set()
+                return
+            
+            except Exception as e:
+                self.logger.warning("Error processing audio chunk: %s", e)
+                continue
+    
     def is_available(self) -> bool:
         """
         Check if OpenWakeWord provider is available.
         
+        The probe result is reused for a short time so re-entering listen_for_wake_word
+        after every utterance doesn't hit the filesystem again.
+        
         Returns:
             bool: True if OpenWakeWord is available and properly configured
         """
+        now = time.monotonic()
+        if self._availability_cached is not None and now - self._availability_ts < _AVAILABILITY_TTL:
+            return self._availability_cached
+        
+        self._availability_cached = self._probe_availability()
+        self._availability_ts = now
+        return self._availability_cached
+    
+    def _probe_availability(self) -> bool:
+        """Check dependencies and model files for is_available()."""
         try:
             # Check if OpenWakeWord is installed
             import openwakeword
             
-            # Check if PyAudio is available
-            import pyaudio
+            # Check if the audio capture backend is available
+            if self.audio_backend == 'sounddevice':
+                # Importing also loads PortAudio, which find_spec() alone wouldn't check
+                import sounddevice  # noqa: F401
+            else:
+                import pyaudio
             
             # Check if model path exists
             if not os.path.exists(self.model_path):
@@ -212,13 +419,12 @@ class OpenWakeWordProvider(BaseWakeWordProvider):
             
             # Check if there are any model files in the path
             if os.path.isdir(self.model_path):
-                model_files = [f for f in os.listdir(self.model_path) if f.endswith('.onnx')]
-                if not model_files:
-                    self.logger.warning(f"No .onnx model files found in: {self.model_path}")
+                if not self._scan_models():
+                    self.logger.warning(f"No {self.inference_framework} model files found in: {self.model_path}")
                     return False
             elif os.path.isfile(self.model_path):
-                if not self.model_path.endswith('.onnx'):
-                    self.logger.warning(f"Model file doesn't appear to be .onnx format: {self.model_path}")
+                if not self.model_path.endswith(self._model_extension):
+                    self.logger.warning(f"Model file doesn't appear to be {self._model_extension} format: {self.model_path}")
                     return False
             
             return True
@@ -276,21 +482,23 @@ class OpenWakeWordProvider(BaseWakeWordProvider):
             return False
         
         # OpenWakeWord specific validation
-        wake_word = wake_word.strip().lower()
+        if _WAKE_WORD_RE.match(wake_word.strip()):
+            return True
         
-        # Should be 1-4 words
+        self._explain_invalid_wake_word(wake_word.strip().lower())
+        return False
+    
+    def _explain_invalid_wake_word(self, wake_word: str):
+        """Log why a wake word failed the OpenWakeWord length rules."""
         words = wake_word.split()
         if len(words) > 4:
             self.logger.warning(f"Wake word too long (>4 words): '{wake_word}'")
-            return False
+            return
         
-        # Each word should be reasonable length
         for word in words:
             if len(word) < 2 or len(word) > 15:
                 self.logger.warning(f"Word length invalid: '{word}' in '{wake_word}'")
-                return False
-        
-        return True
+                return
     
     def get_supported_wake_words(self) -> Optional[list]:
         """
@@ -306,16 +514,14 @@ class OpenWakeWordProvider(BaseWakeWordProvider):
         
         try:
             if os.path.isdir(self.model_path):
-                # Directory of models - extract names from .onnx files
-                for filename in os.listdir(self.model_path):
-                    if filename.endswith('.onnx'):
-                        # Extract wake word name from filename
-                        name = filename.replace('.onnx', '').replace('_', ' ').title()
-                        wake_words.append(name)
-            elif os.path.isfile(self.model_path) and self.model_path.endswith('.onnx'):
+                # Directory of models - extract wake word names from model filenames
+                for filename in self._scan_models():
+                    name = os.path.splitext(filename)[0].replace('_', ' ').title()
+                    wake_words.append(name)
+            elif os.path.isfile(self.model_path) and self.model_path.endswith(self._model_extension):
                 # Single model file
                 filename = os.path.basename(self.model_path)
-                name = filename.replace('.onnx', '').replace('_', ' ').title()
+                name = os.path.splitext(filename)[0].replace('_', ' ').title()
                 wake_words.append(name)
                 
         except Exception as e:
@@ -327,12 +533,15 @@ class OpenWakeWordProvider(BaseWakeWordProvider):
         """Clean up OpenWakeWord resources."""
         try:
             self._stop_listening = True
+            self._availability_cached = None
             if self._listening_thread and self._listening_thread.is_alive():
                 self._listening_thread.join(timeout=1.0)
             
             if self.oww_model:
-                # OpenWakeWord doesn't have explicit cleanup, but we can clear the reference
+                # Only drop our reference; the model stays in _MODEL_CACHE for the next instance
                 self.oww_model = None
+                self._model_names = None
+                self._scores = None
             
             self.logger.debug("OpenWakeWord provider cleaned up")
             
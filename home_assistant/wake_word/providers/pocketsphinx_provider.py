@@ -6,6 +6,8 @@ Free offline speech recognition that can be used for keyword spotting.
 """
 
 import os
+import queue
+import re
 import sys
 import threading
 import time
@@ -14,6 +16,8 @@ import tempfile
 
 from ..base_wake_word_provider import BaseWakeWordProvider, WakeWordConfigurationError, WakeWordProviderUnavailableError
 
+_VOWEL_GROUP_RE = re.compile(r'[aeiouy]+')
+
 
 class PocketSphinxProvider(BaseWakeWordProvider):
     """
@@ -34,30 +38,125 @@ class PocketSphinxProvider(BaseWakeWordProvider):
             config: Configuration dictionary containing:
                 - hmm_path: Path to acoustic model (optional, uses default)
                 - dict_path: Path to dictionary (optional, uses default)
-                - keyphrase_threshold: Detection threshold (default: 1e-20)
+                - keyphrase_threshold: Detection threshold, or 'auto' to scale it by phrase length (default: 1e-20)
+                - wake_words: Additional phrases spotted alongside the wake word (optional)
+                - energy_gate: Skip decoding frames quieter than the noise floor (default False)
+                - refractory_seconds: Ignore repeat detections within this window (default 1.5)
+                - cpu_affinity: CPU ids to pin the detection loop to (optional, Linux only)
+                - rt_priority: SCHED_FIFO priority for the detection loop (optional, Linux only)
+                - flatness_gate: Skip decoding noise-like frames by spectral flatness (default False)
+                - flatness_threshold: Flatness above which a frame counts as noise (default 0.6)
         """
         super().__init__(config)
         
         self.hmm_path = config.get('hmm_path')  # Acoustic model
         self.dict_path = config.get('dict_path')  # Dictionary
-        self.keyphrase_threshold = config.get('keyphrase_threshold', 1e-20)
+        self.keyphrase_threshold = config.get('keyphrase_threshold')
+        if self.keyphrase_threshold is None:
+            self.keyphrase_threshold = 1e-20
+        # With 'auto' each phrase gets a threshold scaled to its length
+        self._threshold_configured = self.keyphrase_threshold != 'auto'
+        if self._threshold_configured:
+            # YAML reads exponents without a dot, like 1e-20, as strings
+            self.keyphrase_threshold = float(self.keyphrase_threshold)
+        self.wake_words = config.get('wake_words')
+        self.energy_gate = config.get('energy_gate', False)
+        self.refractory_seconds = config.get('refractory_seconds', 1.5)
+        self.flatness_gate = config.get('flatness_gate', False)
+        self.flatness_threshold = config.get('flatness_threshold', 0.6)
+        self._spectral_flatness = None
         
         # PocketSphinx components (initialized lazily)
         self.decoder = None
+        self.audio = None
+        self.audio_stream = None
+        self._stream_key = None
+        self._audio_queue = queue.Queue(maxsize=config.get('audio_queue_frames', 64))
+        self._pa_continue = None
+        self._dropped_frames = 0
         
         # Audio processing
         self.sample_rate = 16000
         self.chunk_size = 1024
         
         # State management
-        self._current_keyphrase = None
+        self._current_keyphrases = None
+        self._kws_path = None
+        self._energy_gate = None
+        self._last_detection_ts = float('-inf')
         
         self.logger.debug(f"PocketSphinx provider initialized with threshold: {self.keyphrase_threshold}")
     
+    def _keyphrases(self, wake_word: str) -> tuple:
+        """Get the phrases to spot: the requested wake word followed by any configured aliases."""
+        phrases = [wake_word]
+        for phrase in self.wake_words or []:
+            if phrase not in phrases:
+                phrases.append(phrase)
+        return tuple(phrases)
+    
+    def _write_kws_file(self, phrases: tuple) -> str:
+        """
+        Write a PocketSphinx keyword list file for multi-phrase spotting.
+        
+        Args:
+            phrases: Keyphrases to spot with a single decoder
+            
+        Returns:
+            str: Path of the keyword list file
+        """
+        self._remove_kws_file()
+        with tempfile.NamedTemporaryFile('w', suffix='.kws.list', delete=False) as kws_file:
+            for phrase in phrases:
+                kws_file.write(f"{phrase.lower()} /{self._phrase_threshold(phrase):g}/\n")
+        self._kws_path = kws_file.name
+        return self._kws_path
+    
+    @staticmethod
+    def _auto_threshold(phrase: str) -> float:
+        """
+        Pick a keyphrase threshold from the approximate syllable count of a phrase.
+        
+        Short phrases need a high threshold to avoid false alarms, long phrases a
+        very low one to be detected at all.
+        """
+        syllables = max(1, len(_VOWEL_GROUP_RE.findall(phrase.lower())))
+        return min(1e-1, max(1e-50, 10.0 ** -(2 + 4 * syllables)))
+    
+    def _phrase_threshold(self, phrase: str) -> float:
+        """Get the detection threshold for a phrase, preferring the configured one."""
+        if self._threshold_configured:
+            return self.keyphrase_threshold
+        return self._auto_threshold(phrase)
+    
+    def _remove_kws_file(self):
+        """Delete the keyword list file written for a previous set of phrases."""
+        if self._kws_path:
+            try:
+                os.remove(self._kws_path)
+            except OSError:
+                pass
+            self._kws_path = None
+    
     def _initialize_pocketsphinx(self, wake_word: str):
-        """Initialize PocketSphinx decoder with the specified wake word."""
-        if self.decoder is not None and self._current_keyphrase == wake_word:
-            return
+        """Initialize PocketSphinx decoder with the specified wake word and configured aliases."""
+        phrases = self._keyphrases(wake_word)
+        if self.decoder is not None:
+            if self._current_keyphrases == phrases:
+                return
+            
+            try:
+                # Swap the keyphrase search without reloading the acoustic model
+                if len(phrases) > 1 or not self._threshold_configured:
+                    self.decoder.set_kws('wake_word', self._write_kws_file(phrases))
+                else:
+                    self.decoder.set_keyphrase('wake_word', wake_word)
+                self.decoder.set_search('wake_word')
+                self._current_keyphrases = phrases
+                self.logger.info(f"PocketSphinx keyphrases switched to: {list(phrases)}")
+                return
+            except Exception as e:
+                self.logger.debug(f"Could not switch keyphrase in place, rebuilding decoder: {e}")
         
         try:
             from pocketsphinx import Config, Decoder
@@ -78,9 +177,14 @@ class PocketSphinxProvider(BaseWakeWordProvider):
                 config.set_string('-dict', self.dict_path)
             # else: use default dictionary from pocketsphinx
             
-            # Configure for keyphrase spotting
-            config.set_string('-keyphrase', wake_word)
-            config.set_float('-kws_threshold', self.keyphrase_threshold)
+            # Configure for keyphrase spotting; several phrases share one decoder
+            # through a keyword list file so each chunk is still decoded once, and
+            # the list file also carries per-phrase thresholds
+            if len(phrases) > 1 or not self._threshold_configured:
+                config.set_string('-kws', self._write_kws_file(phrases))
+            else:
+                config.set_string('-keyphrase', wake_word)
+                config.set_float('-kws_threshold', self.keyphrase_threshold)
             
             # Disable unnecessary components for efficiency
             config.set_string('-lm', None)  # Disable language model
@@ -89,9 +193,9 @@ class PocketSphinxProvider(BaseWakeWordProvider):
             
             # Create decoder
             self.decoder = Decoder(config)
-            self._current_keyphrase = wake_word
+            self._current_keyphrases = phrases
             
-            self.logger.info(f"PocketSphinx decoder initialized for keyphrase: '{wake_word}'")
+            self.logger.info(f"PocketSphinx decoder initialized for keyphrases: {list(phrases)}")
             
         except ImportError as e:
             raise WakeWordProviderUnavailableError(
@@ -100,26 +204,75 @@ class PocketSphinxProvider(BaseWakeWordProvider):
         except Exception as e:
             raise WakeWordConfigurationError(f"Failed to initialize PocketSphinx: {e}")
     
-    def _setup_audio(self):
-        """Set up audio recording for wake word detection."""
+    def _ensure_audio(self):
+        """
+        Open the audio stream once and reuse it across detection sessions.
+        
+        The stream is only reopened if the sample rate or chunk size changed;
+        otherwise a paused stream is simply restarted.
+        """
+        stream_key = (self.sample_rate, self.chunk_size)
+        if self.audio_stream is not None and self._stream_key == stream_key:
+            if self.audio_stream.is_stopped():
+                self._drain_audio_queue()
+                self.audio_stream.start_stream()
+            return
+        
         try:
             import pyaudio
-            
-            self.audio = pyaudio.PyAudio()
-            self.audio_stream = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=self.sample_rate,
-                input=True,
-                frames_per_buffer=self.chunk_size
-            )
-            
-            self.logger.debug("Audio stream setup complete for PocketSphinx")
-            
         except ImportError:
             raise WakeWordProviderUnavailableError(
                 "PyAudio not available. Install with: pip install pyaudio"
             )
+        
+        self._close_audio_stream()
+        self._drain_audio_queue()
+        self._pa_continue = pyaudio.paContinue
+        if self.audio is None:
+            self.audio = pyaudio.PyAudio()
+        self.audio_stream = self.audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=self.chunk_size,
+            stream_callback=self._audio_callback
+        )
+        self._stream_key = stream_key
+        
+        self.logger.debug("Audio stream setup complete for PocketSphinx")
+    
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """PyAudio stream callback: hand captured frames to the detection loop."""
+        try:
+            self._audio_queue.put_nowait(in_data)
+        except queue.Full:
+            # Detection fell behind; drop the oldest frame rather than block capture.
+            # Nothing is logged here, drops are reported by the detection loop.
+            try:
+                self._audio_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._audio_queue.put_nowait(in_data)
+            self._dropped_frames += 1
+        return None, self._pa_continue
+    
+    def _drain_audio_queue(self):
+        """Discard frames left over from a previous session."""
+        self._dropped_frames = 0
+        while True:
+            try:
+                self._audio_queue.get_nowait()
+            except queue.Empty:
+                return
+    
+    def _close_audio_stream(self):
+        """Close the audio stream if one is open."""
+        if self.audio_stream:
+            self.audio_stream.stop_stream()
+            self.audio_stream.close()
+            self.audio_stream = None
+            self._stream_key = None
     
     def listen_for_wake_word(self, wake_word: str, timeout: Optional[int] = None) -> Tuple[bool, float]:
         """
@@ -132,51 +285,77 @@ class PocketSphinxProvider(BaseWakeWordProvider):
         Returns:
             Tuple[bool, float]: (detected, confidence_score)
         """
-        if not self.is_available():
+        # An already built decoder proves availability; only probe before the first listen
+        if self.decoder is None and not self.is_available():
             raise WakeWordProviderUnavailableError("PocketSphinx provider is not available")
         
         self._initialize_pocketsphinx(wake_word)
-        self._setup_audio()
+        self._ensure_audio()
+        
+        if self.energy_gate and self._energy_gate is None:
+            # The learned noise floor carries over between sessions
+            from ..energy_gate import EnergyGate
+            self._energy_gate = EnergyGate()
         
+        if self.flatness_gate and self._spectral_flatness is None:
+            from ..energy_gate import spectral_flatness
+            self._spectral_flatness = spectral_flatness
+        
+        scheduling = self._apply_detection_scheduling()
         try:
             self.logger.info(f"Listening for wake word with PocketSphinx: '{wake_word}'")
             
             # Start utterance
             self.decoder.start_utt()
-            start_time = time.time()
+            deadline = time.monotonic() + timeout if timeout else float('inf')
+            frames = 0
             
             while True:
-                # Check timeout
-                if timeout and time.time() - start_time > timeout:
+                # Check timeout every 16 chunks (~1 s of audio) instead of on every one
+                if frames & 15 == 0 and time.monotonic() > deadline:
                     self.logger.debug("PocketSphinx wake word detection timed out")
                     return False, 0.0
                 
+                frames += 1
+                
                 # Read audio data
                 try:
-                    audio_data = self.audio_stream.read(self.chunk_size, exception_on_overflow=False)
+                    # Wait briefly for the next frame so the timeout is still checked while idle
+                    try:
+                        audio_data = self._audio_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        # Nothing captured; check the timeout on the next pass
+                        frames = 0
+                        continue
+                    
+                    # Don't run the acoustic model on silence
+                    if self._energy_gate is not None and not self._energy_gate.is_active(audio_data):
+                        continue
+                    
+                    # Nor on noise-like frames whose spectrum has no speech structure
+                    if (self._spectral_flatness is not None and
+                            self._spectral_flatness(audio_data) > self.flatness_threshold):
+                        continue
                     
                     # Process audio with PocketSphinx
                     self.decoder.process_raw(audio_data, False, False)
                     
-                    # Check for hypothesis (detected keyphrase)
+                    # Check for hypothesis (detected keyphrase). Keyphrase search only
+                    # reports one once its own threshold is met, so the text isn't re-checked
                     hypothesis = self.decoder.hyp()
                     if hypothesis is not None:
-                        detected_text = hypothesis.hypstr
-                        confidence = hypothesis.best_score
+                        now = time.monotonic()
                         
-                        self.logger.info(f"PocketSphinx detected: '{detected_text}' (score: {confidence})")
+                        # Ignore repeats of a detection that was just reported
+                        if now - self._last_detection_ts >= self.refractory_seconds:
+                            self.logger.info(f"PocketSphinx detected: '{hypothesis.hypstr}' (score: {hypothesis.best_score})")
+                            self._last_detection_ts = now
+                            return True, self._score_to_conf(hypothesis.best_score)
                         
-                        # Check if detected text matches our wake word (case insensitive)
-                        if wake_word.lower() in detected_text.lower():
-                            # Convert score to confidence (PocketSphinx scores are negative log probabilities)
-                            # Higher (less negative) scores indicate higher confidence
-                            confidence_score = min(1.0, max(0.0, (confidence + 10000) / 10000))
-                            
-                            return True, confidence_score
-                        else:
-                            # Restart utterance for continuous listening
-                            self.decoder.end_utt()
-                            self.decoder.start_utt()
+                        # Discard the suppressed hypothesis, otherwise it is still pending
+                        # when the window ends and gets reported as a new detection
+                        self.decoder.end_utt()
+                        self.decoder.start_utt()
                     
                 except Exception as e:
                     self.logger.warning(f"Error processing audio with PocketSphinx: {e}")
@@ -189,14 +368,25 @@ class PocketSphinxProvider(BaseWakeWordProvider):
             self.logger.error(f"Error during PocketSphinx wake word detection: {e}")
             raise WakeWordProviderUnavailableError(f"PocketSphinx wake word detection failed: {e}")
         finally:
+            self._restore_detection_scheduling(scheduling)
             # Clean up
             if self.decoder:
                 self.decoder.end_utt()
-            if hasattr(self, 'audio_stream') and self.audio_stream:
+            if self._dropped_frames:
+                self.logger.debug("PocketSphinx fell behind capture, dropped %d audio frames", self._dropped_frames)
+            # Pause capture between sessions; the stream itself is kept for reuse
+            if self.audio_stream and not self.audio_stream.is_stopped():
                 self.audio_stream.stop_stream()
-                self.audio_stream.close()
-            if hasattr(self, 'audio'):
-                self.audio.terminate()
+    
+    @staticmethod
+    def _score_to_conf(score: int) -> float:
+        """
+        Convert a PocketSphinx hypothesis score to a 0-1 confidence.
+        
+        Scores are negative log probabilities, so higher (less negative) scores
+        indicate higher confidence.
+        """
+        return min(1.0, max(0.0, (score + 10000) / 10000))
     
     def is_available(self) -> bool:
         """
@@ -206,27 +396,12 @@ class PocketSphinxProvider(BaseWakeWordProvider):
             bool: True if PocketSphinx is available and properly configured
         """
         try:
-            # Check if PocketSphinx is installed
-            from pocketsphinx import Config, Decoder
-            
-            # Check if PyAudio is available
+            # Only check that the libraries import; building a Decoder loads the
+            # acoustic model from disk and is deferred to the first listen
+            import pocketsphinx
             import pyaudio
             
-            # Try to create a minimal decoder to test functionality
-            try:
-                config = Config()
-                config.set_string('-samprate', '16000')
-                config.set_string('-keyphrase', 'test')
-                config.set_float('-kws_threshold', 1e-20)
-                config.set_string('-lm', None)
-                
-                test_decoder = Decoder(config)
-                # If we get here, PocketSphinx is working
-                return True
-                
-            except Exception as e:
-                self.logger.debug(f"PocketSphinx test initialization failed: {e}")
-                return False
+            return True
             
         except ImportError as e:
             self.logger.debug(f"PocketSphinx not available: {e}")
@@ -312,18 +487,18 @@ class PocketSphinxProvider(BaseWakeWordProvider):
     def cleanup(self):
         """Clean up PocketSphinx resources."""
         try:
-            if hasattr(self, 'audio_stream') and self.audio_stream:
-                self.audio_stream.stop_stream()
-                self.audio_stream.close()
-                self.audio_stream = None
+            self._close_audio_stream()
             
-            if hasattr(self, 'audio'):
+            if self.audio:
                 self.audio.terminate()
+                self.audio = None
             
             if self.decoder:
                 # PocketSphinx decoder doesn't have explicit cleanup
                 self.decoder = None
-                self._current_keyphrase = None
+                self._current_keyphrases = None
+            
+            self._remove_kws_file()
             
             self.logger.debug("PocketSphinx provider cleaned up")
             
@@ -7,12 +7,26 @@ Commercial provider offering high accuracy and low latency detection.
 
 import os
 import sys
-import numpy as np
 from typing import Dict, Any, Tuple, Optional
 import time
 
 from ..base_wake_word_provider import BaseWakeWordProvider, WakeWordConfigurationError, WakeWordProviderUnavailableError
 
+# Map common wake words to Porcupine built-in keywords
+_BUILTIN_KEYWORD_MAP = {
+    'alexa': 'alexa',
+    'computer': 'computer',
+    'jarvis': 'jarvis',
+    'smart mirror': 'smart mirror',
+    'hey google': 'hey google',
+    'hey siri': 'hey siri',
+    'bumblebee': 'bumblebee',
+    'grasshopper': 'grasshopper',
+    'picovoice': 'picovoice',
+    'terminator': 'terminator'
+}
+_BUILTIN_KEYWORDS = frozenset(_BUILTIN_KEYWORD_MAP)
+
 
 class PorcupineProvider(BaseWakeWordProvider):
     """
@@ -33,81 +47,100 @@ class PorcupineProvider(BaseWakeWordProvider):
             config: Configuration dictionary containing:
                 - access_key: Picovoice access key (required)
                 - keyword_path: Path to custom .ppn keyword file (optional)
+                - sensitivity: Detection sensitivity between 0 and 1 (default 0.5)
+                - energy_gate: Skip Porcupine on frames quieter than the noise floor (default False)
+                - refractory_seconds: Ignore repeat detections within this window (default 1.5)
+                - cpu_affinity: CPU ids to pin the detection loop to (optional, Linux only)
+                - rt_priority: SCHED_FIFO priority for the detection loop (optional, Linux only)
+                - batch_frames: Porcupine frames delivered per audio callback (default 4)
         """
         super().__init__(config)
         
         self.access_key = config.get('access_key', 'your-picovoice-key-here')
         self.keyword_path = config.get('keyword_path')
+        self.sensitivity = config.get('sensitivity', 0.5)
+        self.energy_gate = config.get('energy_gate', False)
+        self.refractory_seconds = config.get('refractory_seconds', 1.5)
         
         # Porcupine components (initialized lazily)
         self.porcupine = None
+        self.audio = None
         self.audio_stream = None
+        self._stream_key = None
+        self.audio_queue_frames = config.get('audio_queue_frames', 64)
+        self.batch_frames = max(1, int(config.get('batch_frames', 4)))
+        self._ring = None
+        self._pa_continue = None
         
         # Audio processing settings
         self.sample_rate = 16000
         self.frame_length = 512  # Porcupine requires specific frame length
         
         # State management
-        self._keywords = []
+        self._current_keywords = None
+        self._energy_gate = None
+        self._last_detection_ts = float('-inf')
+        self._available_cache: Optional[bool] = None
+        self._available_key = None
         
         self.logger.debug(f"Porcupine provider initialized with access_key: {'***' if self.access_key != 'your-picovoice-key-here' else 'NOT SET'}")
     
+    def _resolve_keywords(self, wake_word: str) -> Tuple[list, list]:
+        """
+        Pick the keywords Porcupine should load for a wake word.
+        
+        Returns:
+            Tuple[list, list]: (built-in keyword names, custom keyword file paths)
+        """
+        if self.keyword_path and os.path.exists(self.keyword_path):
+            # Use custom keyword file
+            return [], [self.keyword_path]
+        
+        # Try to use built-in keywords
+        wake_word_lower = wake_word.lower()
+        if wake_word_lower in _BUILTIN_KEYWORDS:
+            return [_BUILTIN_KEYWORD_MAP[wake_word_lower]], []
+        
+        # No suitable keyword found
+        raise WakeWordConfigurationError(
+            f"Wake word '{wake_word}' not supported by Porcupine built-in keywords. "
+            f"Available keywords: {', '.join(_BUILTIN_KEYWORD_MAP)}. "
+            f"To use custom wake words, provide a .ppn file path in keyword_path config."
+        )
+    
     def _initialize_porcupine(self, wake_word: str):
-        """Initialize Porcupine with the specified wake word."""
+        """Initialize Porcupine with the specified wake word, rebuilding only if the keyword changed."""
+        keyword_names, keyword_paths = self._resolve_keywords(wake_word)
+        keywords = tuple(keyword_paths or keyword_names)
+        
         if self.porcupine is not None:
-            return
+            if self._current_keywords == keywords:
+                return
+            # Keywords are fixed at creation, so a different one needs a new instance
+            self.porcupine.delete()
+            self.porcupine = None
+            self._current_keywords = None
         
         try:
             import pvporcupine
             
-            # Determine keyword to use
-            keyword_names = []
-            keyword_paths = []
-            
-            if self.keyword_path and os.path.exists(self.keyword_path):
-                # Use custom keyword file
-                keyword_paths.append(self.keyword_path)
-                self.logger.info(f"Using custom Porcupine keyword: {self.keyword_path}")
-            else:
-                # Try to use built-in keywords
-                wake_word_lower = wake_word.lower()
-                
-                # Map common wake words to Porcupine built-in keywords
-                builtin_keywords = {
-                    'alexa': 'alexa',
-                    'computer': 'computer',
-                    'jarvis': 'jarvis',
-                    'smart mirror': 'smart mirror',
-                    'hey google': 'hey google',
-                    'hey siri': 'hey siri',
-                    'bumblebee': 'bumblebee',
-                    'grasshopper': 'grasshopper',
-                    'picovoice': 'picovoice',
-                    'terminator': 'terminator'
-                }
-                
-                if wake_word_lower in builtin_keywords:
-                    keyword_names.append(builtin_keywords[wake_word_lower])
-                    self.logger.info(f"Using built-in Porcupine keyword: {builtin_keywords[wake_word_lower]}")
-                else:
-                    # No suitable keyword found
-                    raise WakeWordConfigurationError(
-                        f"Wake word '{wake_word}' not supported by Porcupine built-in keywords. "
-                        f"Available keywords: {', '.join(builtin_keywords.keys())}. "
-                        f"To use custom wake words, provide a .ppn file path in keyword_path config."
-                    )
-            
             # Initialize Porcupine
+            sensitivities = [self.sensitivity] * len(keywords)
             if keyword_paths:
+                self.logger.info(f"Using custom Porcupine keyword: {self.keyword_path}")
                 self.porcupine = pvporcupine.create(
                     access_key=self.access_key,
-                    keyword_paths=keyword_paths
+                    keyword_paths=keyword_paths,
+                    sensitivities=sensitivities
                 )
             else:
+                self.logger.info(f"Using built-in Porcupine keyword: {keyword_names[0]}")
                 self.porcupine = pvporcupine.create(
                     access_key=self.access_key,
-                    keywords=keyword_names
+                    keywords=keyword_names,
+                    sensitivities=sensitivities
                 )
+            self._current_keywords = keywords
             
             # Verify sample rate
             expected_sample_rate = self.porcupine.sample_rate
@@ -121,6 +154,12 @@ class PorcupineProvider(BaseWakeWordProvider):
                 self.logger.warning(f"Adjusting frame length from {self.frame_length} to {expected_frame_length}")
                 self.frame_length = expected_frame_length
             
+            # Preallocated int16 frames handed straight to porcupine.process()
+            if self._ring is None or self._ring.frame_size != self.frame_length:
+                # Imported here so NumPy is only loaded once Porcupine is actually used
+                from ..audio_buffer import AudioRingBuffer
+                self._ring = AudioRingBuffer(self.frame_length, self.audio_queue_frames)
+            
             self.logger.info("Porcupine initialized successfully")
             
         except ImportError as e:
@@ -129,32 +168,74 @@ class PorcupineProvider(BaseWakeWordProvider):
             )
         except Exception as e:
             if "invalid access key" in str(e).lower():
+                self._available_cache = False
+                self._available_key = (self.access_key, self.keyword_path)
                 raise WakeWordConfigurationError(
                     f"Invalid Porcupine access key. Get your key from: https://console.picovoice.ai/"
                 )
             else:
                 raise WakeWordConfigurationError(f"Failed to initialize Porcupine: {e}")
     
-    def _setup_audio(self):
-        """Set up audio recording for wake word detection."""
+    def _ensure_audio(self):
+        """
+        Open the audio stream once and reuse it across detection sessions.
+        
+        The stream is only reopened if the sample rate, frame length or batch size
+        changed; otherwise a paused stream is simply restarted. Each callback delivers
+        batch_frames Porcupine frames at once, trading up to that many frames of
+        latency for fewer Python callback invocations.
+        """
+        stream_key = (self.sample_rate, self.frame_length, self.batch_frames)
+        if self.audio_stream is not None and self._stream_key == stream_key:
+            if self.audio_stream.is_stopped():
+                self._ring.reset()
+                self.audio_stream.start_stream()
+            return
+        
         try:
             import pyaudio
-            
-            self.audio = pyaudio.PyAudio()
-            self.audio_stream = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=self.sample_rate,
-                input=True,
-                frames_per_buffer=self.frame_length
-            )
-            
-            self.logger.debug("Audio stream setup complete")
-            
         except ImportError:
             raise WakeWordProviderUnavailableError(
                 "PyAudio not available. Install with: pip install pyaudio"
             )
+        
+        self._close_audio_stream()
+        self._ring.reset()
+        self._pa_continue = pyaudio.paContinue
+        if self.audio is None:
+            self.audio = pyaudio.PyAudio()
+        self.audio_stream = self.audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=self.frame_length * self.batch_frames,
+            stream_callback=self._audio_callback
+        )
+        self._stream_key = stream_key
+        
+        self.logger.debug("Audio stream setup complete")
+    
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """
+        PyAudio stream callback: split the captured batch into frames in the ring buffer.
+        
+        Runs on the PortAudio thread, so it only copies data and never logs or blocks;
+        all detection work happens on the thread calling listen_for_wake_word.
+        """
+        data = memoryview(in_data)
+        frame_bytes = self.frame_length * 2
+        for offset in range(0, len(data), frame_bytes):
+            self._ring.write(data[offset:offset + frame_bytes])
+        return None, self._pa_continue
+    
+    def _close_audio_stream(self):
+        """Close the audio stream if one is open."""
+        if self.audio_stream:
+            self.audio_stream.stop_stream()
+            self.audio_stream.close()
+            self.audio_stream = None
+            self._stream_key = None
     
     def listen_for_wake_word(self, wake_word: str, timeout: Optional[int] = None) -> Tuple[bool, float]:
         """
@@ -167,31 +248,55 @@ class PorcupineProvider(BaseWakeWordProvider):
         Returns:
             Tuple[bool, float]: (detected, confidence_score)
         """
-        if not self.is_available():
+        # An already built porcupine proves availability; only probe before the first listen
+        if self.porcupine is None and not self.is_available():
             raise WakeWordProviderUnavailableError("Porcupine provider is not available")
         
         self._initialize_porcupine(wake_word)
-        self._setup_audio()
+        self._ensure_audio()
         
+        if self.energy_gate and self._energy_gate is None:
+            # The learned noise floor carries over between sessions
+            from ..energy_gate import EnergyGate
+            self._energy_gate = EnergyGate()
+        
+        scheduling = self._apply_detection_scheduling()
         try:
             self.logger.info(f"Listening for wake word with Porcupine: '{wake_word}'")
-            start_time = time.time()
+            deadline = time.monotonic() + timeout if timeout else float('inf')
+            frames = 0
             
             while True:
-                # Check timeout
-                if timeout and time.time() - start_time > timeout:
+                # Check timeout every 32 frames (~1 s of audio) instead of on every one
+                if frames & 31 == 0 and time.monotonic() > deadline:
                     self.logger.debug("Porcupine wake word detection timed out")
                     return False, 0.0
                 
+                frames += 1
+                
                 # Read audio data
                 try:
-                    audio_data = self.audio_stream.read(self.frame_length, exception_on_overflow=False)
-                    pcm = np.frombuffer(audio_data, dtype=np.int16)
+                    # Wait briefly for the next frame so the timeout is still checked while idle
+                    pcm = self._ring.read(timeout=0.1)
+                    if pcm is None:
+                        # Nothing captured; check the timeout on the next pass
+                        frames = 0
+                        continue
+                    
+                    # Don't run the keyword model on silence
+                    if self._energy_gate is not None and not self._energy_gate.is_active(pcm):
+                        continue
                     
                     # Process with Porcupine
                     keyword_index = self.porcupine.process(pcm)
                     
                     if keyword_index >= 0:
+                        # Debounce: a detection right after the previous one is the same utterance
+                        now = time.monotonic()
+                        if now - self._last_detection_ts < self.refractory_seconds:
+                            continue
+                        self._last_detection_ts = now
+                        
                         self.logger.info(f"Wake word detected by Porcupine! Keyword index: {keyword_index}")
                         return True, 1.0  # Porcupine doesn't provide confidence scores
                     
@@ -206,21 +311,38 @@ class PorcupineProvider(BaseWakeWordProvider):
             self.logger.error(f"Error during Porcupine wake word detection: {e}")
             raise WakeWordProviderUnavailableError(f"Porcupine wake word detection failed: {e}")
         finally:
-            # Clean up audio resources
-            if self.audio_stream:
+            self._restore_detection_scheduling(scheduling)
+            # The audio callback never logs; report frames it had to drop from here
+            if self._ring is not None and self._ring.overflows:
+                self.logger.debug("Porcupine fell behind capture, dropped %d audio frames", self._ring.overflows)
+            # Pause capture between sessions; the stream itself is kept for reuse
+            if self.audio_stream and not self.audio_stream.is_stopped():
                 self.audio_stream.stop_stream()
-                self.audio_stream.close()
-                self.audio_stream = None
-            if hasattr(self, 'audio'):
-                self.audio.terminate()
     
     def is_available(self) -> bool:
         """
         Check if Porcupine provider is available.
         
+        The access key is not validated here: creating a Porcupine instance is the
+        most expensive init step, so validation happens on first use in
+        _initialize_porcupine, which marks the provider unavailable if the key is rejected.
+        
         Returns:
             bool: True if Porcupine is available and properly configured
         """
+        if self.porcupine is not None:
+            return True
+        
+        cache_key = (self.access_key, self.keyword_path)
+        if self._available_cache is not None and self._available_key == cache_key:
+            return self._available_cache
+        
+        self._available_cache = self._probe_availability()
+        self._available_key = cache_key
+        return self._available_cache
+    
+    def _probe_availability(self) -> bool:
+        """Check dependencies and the access key setting for is_available()."""
         try:
             # Check if Porcupine is installed
             import pvporcupine
@@ -233,22 +355,7 @@ class PorcupineProvider(BaseWakeWordProvider):
                 self.logger.debug("Porcupine access key not configured")
                 return False
             
-            # Try to create a minimal Porcupine instance to validate key
-            try:
-                test_porcupine = pvporcupine.create(
-                    access_key=self.access_key,
-                    keywords=['alexa']  # Use built-in keyword for testing
-                )
-                test_porcupine.delete()
-                return True
-                
-            except Exception as e:
-                if "invalid access key" in str(e).lower():
-                    self.logger.debug(f"Invalid Porcupine access key")
-                    return False
-                else:
-                    self.logger.debug(f"Porcupine availability test failed: {e}")
-                    return False
+            return True
             
         except ImportError as e:
             self.logger.debug(f"Porcupine not available: {e}")
@@ -306,12 +413,7 @@ class PorcupineProvider(BaseWakeWordProvider):
             return True
         
         # Check against built-in keywords
-        builtin_keywords = [
-            'alexa', 'computer', 'jarvis', 'smart mirror', 'hey google', 
-            'hey siri', 'bumblebee', 'grasshopper', 'picovoice', 'terminator'
-        ]
-        
-        if wake_word_lower in builtin_keywords:
+        if wake_word_lower in _BUILTIN_KEYWORDS:
             return True
         
         self.logger.warning(f"Wake word '{wake_word}' not in Porcupine built-in keywords")
@@ -331,25 +433,21 @@ class PorcupineProvider(BaseWakeWordProvider):
             return [name]
         
         # Return built-in keywords
-        return [
-            'Alexa', 'Computer', 'Jarvis', 'Smart Mirror', 'Hey Google',
-            'Hey Siri', 'Bumblebee', 'Grasshopper', 'Picovoice', 'Terminator'
-        ]
+        return [keyword.title() for keyword in _BUILTIN_KEYWORD_MAP]
     
     def cleanup(self):
         """Clean up Porcupine resources."""
         try:
-            if self.audio_stream:
-                self.audio_stream.stop_stream()
-                self.audio_stream.close()
-                self.audio_stream = None
+            self._close_audio_stream()
             
-            if hasattr(self, 'audio'):
+            if self.audio:
                 self.audio.terminate()
+                self.audio = None
             
             if self.porcupine:
                 self.porcupine.delete()
                 self.porcupine = None
+                self._current_keywords = None
             
             self.logger.debug("Porcupine provider cleaned up")
             
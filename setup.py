@@ -14,7 +14,13 @@ def read_readme():
 # Read requirements
 def read_requirements(filename):
     with open(filename, "r", encoding="utf-8") as fh:
-        return [line.strip() for line in fh if line.strip() and not line.startswith("#")]
+        lines = fh.read().splitlines()
+    requirements = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if line:
+            requirements.append(line)
+    return requirements
 
 setup(
     name="home-assistant",
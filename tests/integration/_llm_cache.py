@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache for Integration Tests
+
+Replays AI provider responses recorded by earlier test runs so repeated runs
+don't pay a network round-trip per prompt. Only the provider calls are cached:
+the orchestrator still executes function calls against the test's HomeAPIs mock,
+so the assertions keep exercising the real orchestration logic.
+
+Enable with HA_TEST_LLM_CACHE=1; leave it unset to always call the providers.
+"""
+
+import copy
+import dataclasses
+import hashlib
+import os
+import shelve
+import threading
+
+from home_assistant.ai.base_provider import IntentType
+
+ENABLE_ENV = "HA_TEST_LLM_CACHE"
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".llm_cache")
+# Providers turn API failures into a reply starting with this instead of raising
+ERROR_REPLY_PREFIX = "I'm having trouble processing your request right now."
+
+_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    """Check whether cached provider responses should be used."""
+    return os.environ.get(ENABLE_ENV) == "1"
+
+
+def _cache_key(provider_name, model, method_name, message, api_definitions, context):
+    # Timestamps differ on every run and don't influence the reply
+    context_items = sorted((k, repr(v)) for k, v in (context or {}).items() if k != 'timestamp')
+    api_names = sorted(api_definitions or ())
+    payload = repr((provider_name, model, method_name, message, api_names, context_items))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_error_reply(result):
+    """Check whether a provider reply is the stand-in for a failed API call."""
+    if isinstance(result, str):
+        return result.startswith(ERROR_REPLY_PREFIX)
+    return result.intent == IntentType.UNKNOWN and result.confidence <= 0.1
+
+
+def _cached_call(provider_name, model, method_name, key_args, call):
+    key = _cache_key(provider_name, model, method_name, *key_args)
+    with _lock, shelve.open(CACHE_PATH) as cache:
+        if key in cache:
+            return copy.deepcopy(cache[key])
+
+    result = call()
+    if _is_error_reply(result):
+        # A rate limit or network blip must not be replayed on every later run
+        return result
+
+    stored = result
+    if dataclasses.is_dataclass(result):
+        # SDK response objects don't pickle reliably and tests don't inspect them
+        stored = dataclasses.replace(result, raw_response={})
+    with _lock, shelve.open(CACHE_PATH) as cache:
+        cache[key] = stored
+    return result
+
+
+def install(provider):
+    """
+    Route a provider's chat calls through the on-disk cache.
+
+    Args:
+        provider: BaseAIProvider instance, patched in place (None is ignored)
+    """
+    if provider is None or not is_enabled():
+        return
+
+    provider_name = provider.get_provider_name()
+    model = getattr(provider, 'model', None)
+    chat_with_functions = provider.chat_with_functions
+    simple_chat = provider.simple_chat
+
+    def cached_chat_with_functions(message, api_definitions, context=None):
+        return _cached_call(provider_name, model, "chat_with_functions", (message, api_definitions, context),
+                            lambda: chat_with_functions(message, api_definitions, context))
+
+    def cached_simple_chat(message, context=None):
+        return _cached_call(provider_name, model, "simple_chat", (message, None, context),
+                            lambda: simple_chat(message, context))
+
+    provider.chat_with_functions = cached_chat_with_functions
+    provider.simple_chat = cached_simple_chat
@@ -29,7 +29,9 @@ class IntegrationScenarios:
         self.tts = None
     
     def setup(self):
-        """Initialize components for testing."""
+        """Initialize components for testing, reusing them across scenarios."""
+        if self.recognizer is not None and self.tts is not None:
+            return True
         try:
             self.recognizer = SpeechRecognizer()
             self.tts = TextToSpeech()
@@ -133,9 +135,10 @@ class IntegrationScenarios:
             if self.tts.speak(question):
                 print("✅ Question spoken")
                 
-                # Pause to let user hear the question clearly
-                print("   Waiting 3 seconds for you to hear the question...")
-                time.sleep(3)
+                # Pause to let user hear the question clearly; HA_TEST_FAST=1 skips it
+                if os.getenv("HA_TEST_FAST") != "1":
+                    print("   Waiting 3 seconds for you to hear the question...")
+                    time.sleep(3)
                 
                 # Reinitialize TTS after speech recognition to ensure clean state
                 if i > 1:  # Skip for first question
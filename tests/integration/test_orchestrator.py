@@ -16,7 +16,12 @@ This test suite runs the same scenarios across multiple AI providers
 import sys
 import os
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+
+try:
+    import vcr
+except ImportError:
+    vcr = None
 
 # Add project root to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -28,22 +33,47 @@ from home_assistant.ai.base_provider import AIResponse, IntentType
 from home_assistant.utils.config import ConfigManager
 from home_assistant.apis.decorators import APIRegistry
 from home_assistant.apis.home_apis import HomeAPIs
+from tests.integration import _llm_cache
+
+CASSETTE_DIR = os.path.join(current_dir, 'cassettes')
+
+
+def _scrub_response(response):
+    """Drop session cookies before a provider response is written to a cassette."""
+    response['headers'].pop('set-cookie', None)
+    response['headers'].pop('Set-Cookie', None)
+    return response
+
+
+# Provider HTTP calls are recorded to cassettes on the first run and replayed afterwards.
+# Set HA_TEST_RECORD_MODE=all to refresh them, or none to fail on unrecorded requests.
+# Cassettes hold full prompts and replies, so the directory is git-ignored.
+provider_vcr = vcr.VCR(
+    cassette_library_dir=CASSETTE_DIR,
+    record_mode=os.environ.get('HA_TEST_RECORD_MODE', 'once'),
+    filter_headers=['authorization', 'x-api-key', 'openai-organization', 'cookie'],
+    before_record_response=_scrub_response,
+    decode_compressed_response=True,
+) if vcr else None
 
 
 class TestOrchestrator(unittest.TestCase):
     
-    def setUp(self):
-        """Set up test fixtures for each test."""
-        # Import HomeAPIs to trigger decorator registration
-        from home_assistant.apis.home_apis import HomeAPIs
-        
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared fixtures once for all tests."""
         # Use real ConfigManager
-        self.config_manager = ConfigManager()
+        cls.config_manager = ConfigManager()
         
         # Set a test wake word if none exists
-        if not self.config_manager.get_wake_word():
-            self.config_manager.set_wake_word("TestAssistant")
+        if not cls.config_manager.get_wake_word():
+            cls.config_manager.set_wake_word("TestAssistant")
         
+        # Orchestrators are built once per provider; each test swaps in its own HomeAPIs mock
+        cls._orchestrators = {}
+    
+    def setUp(self):
+        """Set up test fixtures for each test."""
         # Only mock HomeAPIs to verify method calls while keeping everything else real
         self.mock_home_apis = Mock(spec=HomeAPIs)
         self.mock_home_apis.get_weather = Mock(return_value={
@@ -53,23 +83,52 @@ class TestOrchestrator(unittest.TestCase):
             "forecast": "1 day forecast",
             "units": "metric"
         })
+        
+        # Each test gets its own cassette, so provider replies are pinned per provider
+        if provider_vcr:
+            cassette = provider_vcr.use_cassette(f"{self._testMethodName}.yaml")
+            cassette.__enter__()
+            self.addCleanup(cassette.__exit__, None, None, None)
     
     def _setup_orchestrator_for_provider(self, provider_name):
-        """Setup orchestrator with specific provider."""
-        # Force specific provider for this test
-        ai_config = self.config_manager.get_ai_config()
-        ai_config['provider'] = provider_name
-        self.config_manager.config['ai'] = ai_config
-        
-        # Create real orchestrator with specific provider
-        orchestrator = AIOrchestrator(self.config_manager)
+        """Get the shared orchestrator for a specific provider, wired to this test's HomeAPIs mock."""
+        orchestrator = self._orchestrators.get(provider_name)
+        if orchestrator is None:
+            # Force specific provider for this orchestrator without persisting it
+            ai_config = dict(self.config_manager.get_ai_config())
+            ai_config['provider'] = provider_name
+            # Recorded requests replay without a key; headers are filtered from cassettes anyway
+            key_name = f'{provider_name}_api_key'
+            if not ai_config.get(key_name) and self._has_cassettes(provider_name):
+                ai_config[key_name] = 'cassette-replay'
+            with patch.object(self.config_manager, 'get_ai_config', side_effect=lambda: dict(ai_config)):
+                # Create real orchestrator with specific provider
+                orchestrator = AIOrchestrator(self.config_manager)
+            orchestrator._initialize_api_components()
+            
+            # Replay recorded provider replies when HA_TEST_LLM_CACHE=1
+            _llm_cache.install(orchestrator.current_provider)
+            _llm_cache.install(orchestrator.fallback_provider)
+            self._orchestrators[provider_name] = orchestrator
         
-        # Replace the orchestrator's home_apis with our mock after initialization
-        orchestrator._initialize_api_components()
+        # Replace the orchestrator's home_apis with this test's mock
         orchestrator.home_apis = self.mock_home_apis
         
         return orchestrator
     
+    @staticmethod
+    def _has_cassettes(provider_name):
+        """Check whether any test has recorded traffic for a provider."""
+        return provider_vcr is not None and os.path.isdir(CASSETTE_DIR) and any(
+            name.endswith(f"_{provider_name}.yaml") for name in os.listdir(CASSETTE_DIR))
+    
+    def _skip_unless_available(self, orchestrator, provider_name):
+        """Skip the test unless the provider can be called or this test's cassette can be replayed."""
+        if provider_vcr is not None and os.path.exists(os.path.join(CASSETTE_DIR, f"{self._testMethodName}.yaml")):
+            return
+        if not orchestrator.get_available_providers().get(provider_name, False):
+            self.skipTest(f"{provider_name} provider not available (missing API key)")
+    
     def test_function_calling_weather_detection_and_execution_anthropic(self):
         """Test that orchestrator detects weather request using Anthropic function calling."""
         self._test_function_calling_weather_detection_and_execution("anthropic")
@@ -87,9 +146,7 @@ class TestOrchestrator(unittest.TestCase):
         orchestrator = self._setup_orchestrator_for_provider(provider_name)
         
         # Check if specific provider is available
-        available_providers = orchestrator.get_available_providers()
-        if not available_providers.get(provider_name, False):
-            self.skipTest(f"{provider_name} provider not available (missing API key)")
+        self._skip_unless_available(orchestrator, provider_name)
         
         # Test user message that should trigger weather API via function calling
         user_message = "what is the weather today in Tampa?"
@@ -152,9 +209,7 @@ class TestOrchestrator(unittest.TestCase):
         orchestrator = self._setup_orchestrator_for_provider(provider_name)
         
         # Check if specific provider is available
-        available_providers = orchestrator.get_available_providers()
-        if not available_providers.get(provider_name, False):
-            self.skipTest(f"{provider_name} provider not available (missing API key)")
+        self._skip_unless_available(orchestrator, provider_name)
         
         # Test user message that should NOT trigger any function
         user_message = "Hello, how are you doing today?"
@@ -189,9 +244,7 @@ class TestOrchestrator(unittest.TestCase):
         orchestrator = self._setup_orchestrator_for_provider(provider_name)
         
         # Check if specific provider is available
-        available_providers = orchestrator.get_available_providers()
-        if not available_providers.get(provider_name, False):
-            self.skipTest(f"{provider_name} provider not available (missing API key)")
+        self._skip_unless_available(orchestrator, provider_name)
         
         # Configure mock to raise exception when called
         self.mock_home_apis.get_weather.side_effect = Exception("Weather service unavailable")
@@ -233,7 +286,6 @@ class TestOrchestrator(unittest.TestCase):
         orchestrator = self._setup_orchestrator_for_provider(provider_name)
         
         # Verify API components are initialized correctly
-        orchestrator._initialize_api_components()
         self.assertIsNotNone(orchestrator.api_registry)
         self.assertIsNotNone(orchestrator.api_executor)
         
@@ -274,6 +326,10 @@ def run_orchestrator_tests():
     print("  - Uses real ConfigManager and AI providers")
     print("  - Makes actual API calls with native function calling")
     print("  - Only mocks HomeAPIs to verify correct method calls")
+    if _llm_cache.is_enabled():
+        print("  - Replays cached provider responses (HA_TEST_LLM_CACHE=1)")
+    if provider_vcr:
+        print(f"  - Records/replays provider HTTP traffic in {CASSETTE_DIR}")
     print()
     print("Test scenarios:")
     print("  1. Function call detection and execution (weather API)")
@@ -282,7 +338,8 @@ def run_orchestrator_tests():
     print("  4. Function calling system setup validation")
     print()
     
-    # Run the test suite
+    # Run the test suite; replayed cassettes make it fast, and VCR patches the
+    # HTTP clients process-wide, so the providers' tests run one after another
     loader = unittest.TestLoader()
     suite = loader.loadTestsFromTestCase(TestOrchestrator)
     runner = unittest.TextTestRunner(verbosity=2)
@@ -6,7 +6,6 @@ Tests multiple TTS providers: pyttsx, espeak, piper
 
 import sys
 import os
-import time
 import unittest
 
 # Add project root to Python path - more robust path detection
@@ -190,10 +189,6 @@ class TestTTS(unittest.TestCase):
                 print(f"✅ {provider_name} phrase {i} completed")
             else:
                 print(f"❌ {provider_name} phrase {i} failed")
-            
-            # Brief delay between phrases
-            if i < total_phrases:
-                time.sleep(1)
         
         print(f"📊 {provider_name} Results: {success_count}/{total_phrases} phrases successful")
         self.assertEqual(success_count, total_phrases, f"All {provider_name} phrases should complete successfully")
@@ -1 +1,6 @@
-# Unit tests - no external dependencies
\ No newline at end of file
+# Unit tests - no external dependencies
+import os
+import tempfile
+
+# Keep log output from the code under test out of the repository's logs/ directory
+os.environ.setdefault("HA_LOGS_DIR", tempfile.mkdtemp(prefix="home_assistant-test-logs-"))
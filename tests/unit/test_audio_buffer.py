@@ -0,0 +1,82 @@
+import threading
+import unittest
+
+import numpy as np
+
+from home_assistant.wake_word.audio_buffer import AudioRingBuffer, pcm_view
+
+
+class TestAudioRingBuffer(unittest.TestCase):
+
+    def test_capacity_must_be_power_of_two(self):
+        """Test that non power-of-two capacities are rejected."""
+        with self.assertRaises(ValueError):
+            AudioRingBuffer(4, capacity=6)
+
+    def test_with_min_bytes_rounds_up_to_power_of_two(self):
+        """Test that the sized constructor picks the smallest fitting capacity."""
+        ring = AudioRingBuffer.with_min_bytes(1280, 1 << 20)
+
+        self.assertEqual(ring.capacity, 512)
+        self.assertGreaterEqual(ring.capacity * ring.frame_size * 2, 1 << 20)
+
+    def test_frames_read_in_order(self):
+        """Test that frames come out in the order they were written."""
+        ring = AudioRingBuffer(4, capacity=4)
+        ring.write(np.arange(4, dtype=np.int16).tobytes())
+        ring.write(np.arange(4, 8, dtype=np.int16).tobytes())
+
+        self.assertEqual(ring.available, 2)
+        np.testing.assert_array_equal(ring.read(timeout=0), [0, 1, 2, 3])
+        np.testing.assert_array_equal(ring.read(timeout=0), [4, 5, 6, 7])
+        self.assertIsNone(ring.read(timeout=0))
+
+    def test_short_frame_zero_padded(self):
+        """Test that a partial frame is padded with silence."""
+        ring = AudioRingBuffer(4, capacity=2)
+        ring.write(np.array([9, 9], dtype=np.int16).tobytes())
+
+        np.testing.assert_array_equal(ring.read(timeout=0), [9, 9, 0, 0])
+
+    def test_overflow_drops_newest_frames(self):
+        """Test that writes are dropped instead of overwriting unread frames."""
+        ring = AudioRingBuffer(2, capacity=4)
+        for value in range(5):
+            ring.write(np.full(2, value, dtype=np.int16).tobytes())
+
+        # One slot is reserved for the consumer, so only capacity - 1 frames fit
+        self.assertEqual(ring.available, 3)
+        self.assertEqual(ring.overflows, 2)
+        np.testing.assert_array_equal(ring.read(timeout=0), [0, 0])
+
+    def test_blocked_reader_woken_by_writer(self):
+        """Test that a reader waiting on an empty buffer is woken by the next write."""
+        ring = AudioRingBuffer(2, capacity=4)
+        writer = threading.Timer(0.05, ring.write, args=(np.array([7, 7], dtype=np.int16).tobytes(),))
+        writer.start()
+
+        frame = ring.read(timeout=2.0)
+        writer.join()
+
+        self.assertIsNotNone(frame)
+        np.testing.assert_array_equal(frame, [7, 7])
+
+
+class TestPcmView(unittest.TestCase):
+
+    def test_view_shares_memory(self):
+        """Test that PCM bytes are viewed as int16 samples without a copy."""
+        buf = bytearray(np.array([1, -2, 3], dtype=np.int16).tobytes())
+        view = pcm_view(buf, frame_length=3)
+
+        np.testing.assert_array_equal(view, [1, -2, 3])
+        self.assertTrue(np.shares_memory(view, np.frombuffer(buf, dtype=np.int16)))
+
+    def test_wrong_length_rejected(self):
+        """Test that a buffer of the wrong size is rejected."""
+        with self.assertRaises(ValueError):
+            pcm_view(b'\x00' * 6, frame_length=4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,349 @@
+import gc
+import json
+import os
+import sys
+import tempfile
+import types
+import unittest
+import weakref
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# chatgpt.py imports its logger as a top-level module from its own directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'home_assistant'))
+
+try:
+    import chatgpt
+except ImportError:
+    # The tests never reach the API, so a stand-in is enough without the SDK; it is
+    # only visible to chatgpt, so other modules still see openai as missing
+    _openai = types.ModuleType("openai")
+    _openai.OpenAI = MagicMock(name="OpenAI")
+    _openai.AsyncOpenAI = MagicMock(name="AsyncOpenAI")
+    _openai.RateLimitError = type("RateLimitError", (Exception,), {})
+    with patch.dict(sys.modules, {"openai": _openai}):
+        import chatgpt
+
+
+def setUpModule():
+    # The logger resolves its logs/ directory on first use, before the tests chdir into temp dirs
+    chatgpt.setup_logging("home_assistant.chatgpt")
+
+
+def _completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+class _FakeSemanticCache:
+    """
+    Semantic cache stand-in: the embedder ignores case, and near-duplicate
+    signatures also ignore spacing and punctuation.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.near_duplicates = {}
+        self.lookups = 0
+        self.near_duplicate_lookups = 0
+
+    def signature(self, text):
+        return "".join(c for c in text.lower() if c.isalnum())
+
+    def lookup_near_duplicate(self, signature):
+        self.near_duplicate_lookups += 1
+        return self.near_duplicates.get(signature)
+
+    def embed(self, text):
+        return text.lower()
+
+    def lookup(self, embedding):
+        self.lookups += 1
+        return self.entries.get(embedding)
+
+    def add(self, embedding, reply, signature=None):
+        self.entries[embedding] = reply
+        if signature is not None:
+            self.near_duplicates[signature] = reply
+
+    def clear(self):
+        self.entries.clear()
+        self.near_duplicates.clear()
+
+
+class ChatGPTTestCase(unittest.TestCase):
+    """Runs each test in its own directory, since the log files are created relative to it."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tmp_dir.name)
+
+        self.chat = chatgpt.ChatGPT()
+        self.addCleanup(self.chat._close_log_files)
+        self.chat.api_token = "test-key"
+        self.chat.client = MagicMock()
+
+    def use_semantic_cache(self):
+        cache = _FakeSemanticCache()
+        self.chat.semantic_cache_threshold = 0.9
+        self.chat._semantic_cache = cache
+        return cache
+
+
+class TestSemanticCacheContext(ChatGPTTestCase):
+
+    def test_standalone_question_is_reused(self):
+        """Test that a repeated first-turn question is answered from the semantic cache."""
+        self.use_semantic_cache()
+        self.chat.client.chat.completions.create.return_value = _completion("Paris.")
+
+        self.chat.prompt("What's the capital of France?")
+        self.chat.clearMessages()
+
+        self.assertEqual(self.chat.prompt("what's the capital of france?"), "Paris.")
+        self.assertEqual(self.chat.client.chat.completions.create.call_count, 1)
+
+    def test_follow_up_is_not_cached(self):
+        """Test that follow-ups neither read nor populate the semantic cache."""
+        cache = self.use_semantic_cache()
+        cache.add("and tomorrow?", "Rain in Paris.")
+        self.chat.client.chat.completions.create.side_effect = [_completion("Sunny."), _completion("Windy.")]
+
+        self.chat.prompt("What's the weather in Tampa?")
+
+        self.assertEqual(self.chat.prompt("And tomorrow?"), "Windy.")
+        self.assertEqual(cache.lookups, 1)
+        self.assertEqual(cache.entries["and tomorrow?"], "Rain in Paris.")
+
+    def test_model_change_clears_cache(self):
+        """Test that replies from one model aren't served after switching to another."""
+        cache = self.use_semantic_cache()
+        cache.add("hello", "Hi!")
+
+        self.chat.model("gpt-4")
+
+        self.assertEqual(cache.entries, {})
+
+    def test_customizations_change_clears_cache(self):
+        """Test that changing API options drops cached replies, while cache-only options don't."""
+        cache = self.use_semantic_cache()
+        cache.add("hello", "Hi!")
+
+        self.chat.customiseResponse({"semantic_cache_threshold": 0.9})
+        self.assertEqual(cache.entries, {"hello": "Hi!"})
+
+        self.chat.customiseResponse({"semantic_cache_threshold": 0.9, "temperature": 0.2})
+        self.assertEqual(cache.entries, {})
+
+
+class TestMaxTurns(ChatGPTTestCase):
+
+    def test_history_is_trimmed(self):
+        """Test that max_turns keeps only the most recent exchanges."""
+        self.chat.client.chat.completions.create.side_effect = [_completion("One."), _completion("Two.")]
+        self.chat.customiseResponse({"max_turns": 1})
+
+        self.chat.prompt("First?")
+        self.chat.prompt("Second?")
+
+        self.assertEqual([m["content"] for m in self.chat.messages], ["Second?", "Two."])
+
+    def test_invalid_max_turns_rejected(self):
+        """Test that max_turns must be a positive integer and a bad value changes nothing."""
+        self.chat.customiseResponse({"temperature": 0.2})
+
+        for max_turns in (0, -1, None, 1.5, "3", True):
+            with self.subTest(max_turns=max_turns):
+                with self.assertRaises(ValueError):
+                    self.chat.customiseResponse({"max_turns": max_turns})
+                self.assertEqual(self.chat.customizations, {"temperature": 0.2})
+                self.assertEqual(self.chat.messages.maxlen, 2 * chatgpt.DEFAULT_MAX_TURNS)
+
+
+class TestNearDuplicateContext(ChatGPTTestCase):
+
+    def test_near_duplicate_standalone_question_hits(self):
+        """Test that a typo-level variant of a cached first-turn question skips the API."""
+        cache = self.use_semantic_cache()
+        self.chat.client.chat.completions.create.return_value = _completion("Paris.")
+
+        self.chat.prompt("What's the capital of France?")
+        self.chat.clearMessages()
+
+        self.assertEqual(self.chat.prompt("Whats the capital of France"), "Paris.")
+        self.assertEqual(cache.lookups, 1)
+        self.assertEqual(self.chat.client.chat.completions.create.call_count, 1)
+
+    def test_near_duplicate_in_other_conversation_misses(self):
+        """Test that a near-duplicate asked mid-conversation goes to the API instead of the shortcut."""
+        cache = self.use_semantic_cache()
+        self.chat.client.chat.completions.create.side_effect = [
+            _completion("Paris."), _completion("Sure."), _completion("It's Paris, as in the story."),
+        ]
+
+        self.chat.prompt("What's the capital of France?")
+        self.chat.clearMessages()
+        self.chat.prompt("Let's talk about the book we read.")
+        reply = self.chat.prompt("Whats the capital of France")
+
+        self.assertEqual(reply, "It's Paris, as in the story.")
+        self.assertEqual(cache.near_duplicate_lookups, 2)
+        self.assertEqual(self.chat.client.chat.completions.create.call_count, 3)
+
+
+class TestPromptStream(ChatGPTTestCase):
+
+    def stream_reply(self, *deltas):
+        chunks = [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=d))]) for d in deltas]
+        stream = MagicMock()
+        stream.__iter__.return_value = iter(chunks)
+        self.chat.client.chat.completions.create.return_value = stream
+        return stream
+
+    def test_complete_stream_is_recorded(self):
+        """Test that a fully consumed stream records the whole reply."""
+        self.stream_reply("Paris ", "is lovely.")
+
+        self.assertEqual("".join(self.chat.prompt_stream("Tell me about Paris")), "Paris is lovely.")
+        self.assertEqual(list(self.chat.messages)[-1], {"role": "assistant", "content": "Paris is lovely."})
+
+    def test_closed_stream_records_partial_reply(self):
+        """Test that closing the generator early keeps turns alternating and skips the cache."""
+        stream = self.stream_reply("Paris ", "is lovely.")
+        self.chat.cache_ttl = 3600
+
+        replies = self.chat.prompt_stream("Tell me about Paris")
+        self.assertEqual(next(replies), "Paris ")
+        replies.close()
+
+        self.assertEqual([m["role"] for m in self.chat.messages], ["user", "assistant"])
+        self.assertEqual(self.chat.messages[-1]["content"], "Paris ")
+        stream.close.assert_called_once()
+        self.assertEqual(self.chat._load_exact_cache(), {})
+        self.chat._close_log_files()
+        with open(self.chat.log_path, "rb") as f:
+            self.assertIn(b"User: Tell me about Paris\nChatGPT: Paris \n", f.read())
+
+
+class TestWaitForBatch(ChatGPTTestCase):
+
+    def batch(self, status, output_file_id=None, error_file_id=None):
+        return SimpleNamespace(status=status, output_file_id=output_file_id, error_file_id=error_file_id)
+
+    def files(self, **contents):
+        self.chat.client.files.content.side_effect = lambda file_id: SimpleNamespace(text=contents[file_id])
+
+    @staticmethod
+    def line(custom_id, status_code, body):
+        return json.dumps({"custom_id": custom_id, "response": {"status_code": status_code, "body": body}})
+
+    def test_completed_batch(self):
+        """Test that replies are read from the output file and failed requests are left out."""
+        self.chat.client.batches.retrieve.return_value = self.batch("completed", "out", "err")
+        self.files(
+            out=self.line("prompt-0", 200, {"choices": [{"message": {"content": "Paris."}}]}),
+            err=self.line("prompt-1", 400, {"error": {"message": "bad request"}}),
+        )
+
+        self.assertEqual(self.chat.wait_for_batch("batch-1"), {"prompt-0": "Paris."})
+
+    def test_failed_batch(self):
+        """Test that a failed batch raises instead of returning empty replies."""
+        self.chat.client.batches.retrieve.return_value = self.batch("failed")
+
+        with self.assertRaises(Exception):
+            self.chat.wait_for_batch("batch-1")
+        self.chat.client.files.content.assert_not_called()
+
+    def test_completed_batch_with_only_errors(self):
+        """Test that a completed batch without an output file reads the error file and returns nothing."""
+        self.chat.client.batches.retrieve.return_value = self.batch("completed", None, "err")
+        self.files(err=self.line("prompt-0", 429, {"error": {"message": "rate limited"}}))
+
+        self.assertEqual(self.chat.wait_for_batch("batch-1"), {})
+        self.chat.client.files.content.assert_called_once_with("err")
+
+
+class _FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 3, 15, 12, 0)
+
+
+class TestLogCleanup(ChatGPTTestCase):
+    # Cutoff is 2026-02-13 12:00; that whole day is dropped
+    OLD = datetime(2026, 1, 1, 10, 0)
+    CUTOFF_DAY = datetime(2026, 2, 13, 18, 0)
+    RECENT = datetime(2026, 3, 10, 9, 0)
+
+    def setUp(self):
+        super().setUp()
+        for when, user in ((self.OLD, "old"), (self.CUTOFF_DAY, "cutoff day"), (self.RECENT, "recent")):
+            with patch.object(chatgpt.time, "time", return_value=when.timestamp()):
+                self.chat._log_message(user, "reply")
+        self.chat._close_log_files()
+
+    def clean(self):
+        with patch.object(chatgpt, "datetime", _FixedDatetime):
+            self.chat.clearMessages()
+        self.chat._close_log_files()
+        with open(self.chat.log_path, "rb") as f:
+            return f.read()
+
+    def assert_only_recent_kept(self, log, indexed_at):
+        self.assertTrue(log.startswith(b"[2026-03-10, 09:00:00]\nUser: recent\n"), log)
+        self.assertNotIn(b"cutoff day", log)
+        self.assertEqual(self.chat._read_log_index(), [(int(indexed_at.timestamp()), 0)])
+
+    def test_index_path(self):
+        """Test that the sidecar index trims whole days, like parsing does."""
+        self.assert_only_recent_kept(self.clean(), self.RECENT)
+
+    def test_without_index(self):
+        """Test that a log without an index is parsed and gets a fresh index."""
+        os.remove(self.chat.index_path)
+
+        # Parsed entries are indexed at midnight of their day
+        self.assert_only_recent_kept(self.clean(), datetime(2026, 3, 10))
+
+    def test_index_past_end_of_log(self):
+        """Test that an index with entries beyond the end of the log falls back to parsing."""
+        entries = self.chat._read_log_index()
+        self.chat._write_log_index(entries + [(entries[-1][0], os.path.getsize(self.chat.log_path) + 100)])
+
+        self.assert_only_recent_kept(self.clean(), datetime(2026, 3, 10))
+
+    def test_index_offset_off_entry_boundary(self):
+        """Test that an index whose cut point isn't an entry header falls back to parsing."""
+        entries = self.chat._read_log_index()
+        entries[2] = (entries[2][0], entries[2][1] + 3)
+        self.chat._write_log_index(entries)
+
+        self.assert_only_recent_kept(self.clean(), datetime(2026, 3, 10))
+
+
+class TestLogFileLifetime(ChatGPTTestCase):
+
+    def test_instances_are_not_kept_alive(self):
+        """Test that the exit hook doesn't hold a reference to every instance."""
+        chat = chatgpt.ChatGPT()
+        self.assertIn(chat, chatgpt._open_chats)
+        chat_ref = weakref.ref(chat)
+
+        del chat
+        gc.collect()
+        self.assertIsNone(chat_ref())
+
+    def test_exit_hook_flushes_open_logs(self):
+        """Test that buffered log entries reach the file when the exit hook runs."""
+        self.chat._log_message("hello", "Hi!")
+
+        chatgpt._close_all_log_files()
+
+        with open(self.chat.log_path, "rb") as f:
+            self.assertIn(b"User: hello\nChatGPT: Hi!", f.read())
+
+if __name__ == '__main__':
+    unittest.main()
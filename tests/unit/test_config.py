@@ -2,9 +2,10 @@ import unittest
 import tempfile
 import os
 import yaml
+from collections.abc import Mapping
 from unittest.mock import patch, mock_open, Mock
 
-from home_assistant.utils.config import ConfigManager
+from home_assistant.utils.config import ConfigManager, load_yaml
 
 
 class TestConfigManager(unittest.TestCase):
@@ -65,11 +66,143 @@ class TestConfigManager(unittest.TestCase):
         config_manager = ConfigManager(self.config_path)
         config = config_manager.get_config()
         
-        self.assertIsInstance(config, dict)
+        self.assertIsInstance(config, Mapping)
         self.assertIn('wake_word', config)
         self.assertIn('speech', config)
         self.assertIn('audio', config)
     
+    def test_get_config_is_read_only(self):
+        """Test that the full configuration view cannot be modified."""
+        config_manager = ConfigManager(self.config_path)
+        config = config_manager.get_config()
+        
+        with self.assertRaises(TypeError):
+            config['wake_word'] = {}
+        with self.assertRaises(TypeError):
+            config['wake_word']['name'] = "Changed"
+        self.assertIsNone(config_manager.get_wake_word())
+    
+    def test_get_config_snapshot_unchanged_by_setters(self):
+        """Test that a previously returned view is not mutated by later writes."""
+        config_manager = ConfigManager(self.config_path)
+        config_manager.set_wake_word("Alexa")
+        snapshot = config_manager.get_config()
+        
+        config_manager.set_wake_word("Jarvis")
+        config_manager.set_wake_word_provider("porcupine")
+        
+        self.assertEqual(snapshot['wake_word']['name'], "Alexa")
+        self.assertEqual(snapshot['wake_word']['detection']['provider'], "openwakeword")
+        self.assertEqual(config_manager.get_wake_word(), "Jarvis")
+        self.assertEqual(config_manager.get_wake_word_provider(), "porcupine")
+    
+    def test_section_accessors_are_read_only(self):
+        """Test that section accessors return views that cannot change the live config."""
+        config_manager = ConfigManager(self.config_path)
+        detection_config = config_manager.get_wake_word_detection_config()
+        
+        with self.assertRaises(TypeError):
+            detection_config['provider'] = "porcupine"
+        with self.assertRaises(TypeError):
+            detection_config['providers']['openwakeword']['threshold'] = 0.9
+        self.assertEqual(config_manager.get_wake_word_provider(), "openwakeword")
+    
+    def test_save_read_only_view(self):
+        """Test that a view from get_config() can be saved back as plain YAML."""
+        config_manager = ConfigManager(self.config_path)
+        config_manager.set_wake_word("Alexa")
+        
+        config_manager.save_config(config_manager.get_config())
+        
+        with open(self.config_path, 'r') as f:
+            saved = yaml.safe_load(f)
+        self.assertEqual(saved['wake_word']['name'], "Alexa")
+        self.assertEqual(ConfigManager(self.config_path).get_wake_word(), "Alexa")
+    
+    def test_get_mutable_config_is_independent(self):
+        """Test that the mutable config copy does not alias the live config."""
+        config_manager = ConfigManager(self.config_path)
+        config = config_manager.get_mutable_config()
+        
+        config['wake_word']['name'] = "Changed"
+        
+        self.assertIsNone(config_manager.get_wake_word())
+    
+    def _write_ai_configs(self):
+        """Write a main config pointing at a temporary AI config file."""
+        ai_config_path = os.path.join(self.temp_dir, 'test_ai_config.yaml')
+        with open(ai_config_path, 'w') as f:
+            yaml.dump({
+                'anthropic_api_key': 'anthropic-key',
+                'openai_api_key': 'openai-key',
+                'anthropic': {'model': 'claude-test'},
+                'openai': {'model': 'gpt-test'}
+            }, f)
+        with open(self.config_path, 'w') as f:
+            yaml.dump({'ai': {'config_file': ai_config_path, 'provider': 'anthropic'}}, f)
+        return ai_config_path
+    
+    def test_ai_config_memoized(self):
+        """Test that the merged AI config is reused between calls."""
+        ai_config_path = self._write_ai_configs()
+        config_manager = ConfigManager(self.config_path)
+        
+        ai_config = config_manager.get_ai_config()
+        
+        self.assertEqual(ai_config['model'], 'claude-test')
+        self.assertIs(config_manager.get_ai_config(), ai_config)
+        os.remove(ai_config_path)
+    
+    def test_ai_config_is_read_only(self):
+        """Test that the cached AI config can't be corrupted by a caller."""
+        ai_config_path = self._write_ai_configs()
+        config_manager = ConfigManager(self.config_path)
+        ai_config = config_manager.get_ai_config()
+        
+        with self.assertRaises(TypeError):
+            ai_config['model'] = 'changed'
+        
+        copied = dict(ai_config)
+        copied['model'] = 'changed'
+        self.assertEqual(config_manager.get_ai_config()['model'], 'claude-test')
+        os.remove(ai_config_path)
+    
+    def test_ai_config_invalidated_on_save_and_reload(self):
+        """Test that saving or reloading config refreshes the merged AI config."""
+        ai_config_path = self._write_ai_configs()
+        config_manager = ConfigManager(self.config_path)
+        config_manager.get_ai_config()
+        
+        config_manager.set_ai_provider('openai')
+        self.assertEqual(config_manager.get_ai_config()['model'], 'gpt-test')
+        
+        with open(ai_config_path, 'w') as f:
+            yaml.dump({'openai': {'model': 'gpt-reloaded'}}, f)
+        config_manager.reload_ai_config()
+        self.assertEqual(config_manager.get_ai_config()['model'], 'gpt-reloaded')
+        os.remove(ai_config_path)
+    
+    def test_load_yaml_returns_independent_copies(self):
+        """Test that cached YAML parses are copied so callers can't change each other's data."""
+        with open(self.config_path, 'w') as f:
+            yaml.dump({'tts': {'provider': 'piper'}}, f)
+        
+        first = load_yaml(self.config_path)
+        first['tts']['provider'] = 'changed'
+        
+        self.assertEqual(load_yaml(self.config_path), {'tts': {'provider': 'piper'}})
+    
+    def test_load_yaml_sees_file_changes(self):
+        """Test that a rewritten file is parsed again."""
+        with open(self.config_path, 'w') as f:
+            yaml.dump({'value': 1}, f)
+        load_yaml(self.config_path)
+        
+        with open(self.config_path, 'w') as f:
+            yaml.dump({'value': 22}, f)
+        
+        self.assertEqual(load_yaml(self.config_path), {'value': 22})
+    
     @patch('builtins.open', side_effect=IOError("File error"))
     @patch('home_assistant.utils.config.setup_logging')
     def test_error_handling_load(self, mock_setup_logging, mock_open):
@@ -98,6 +231,18 @@ class TestConfigManager(unittest.TestCase):
         # Should log the error when save fails
         mock_logger.error.assert_called()
 
+    
+    def test_failed_save_keeps_previous_file(self):
+        """Test that a save that fails midway leaves the old config intact."""
+        config_manager = ConfigManager(self.config_path)
+        config_manager.set_wake_word("Alexa")
+        
+        with patch('yaml.dump', side_effect=IOError("Write error")):
+            config_manager.set_wake_word("Jarvis")
+        
+        self.assertEqual(ConfigManager(self.config_path).get_wake_word(), "Alexa")
+        self.assertFalse(os.path.exists(self.config_path + '.tmp'))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+from home_assistant.wake_word.energy_gate import EnergyGate, spectral_flatness
+
+
+def _tone(amplitude, length=512):
+    return (amplitude * np.sin(np.linspace(0, 20 * np.pi, length))).astype(np.int16)
+
+
+class TestEnergyGate(unittest.TestCase):
+
+    def test_warmup_frames_pass_through(self):
+        """Test that frames are decoded while the noise floor is being learned."""
+        gate = EnergyGate(warmup_frames=3)
+        silence = np.zeros(512, dtype=np.int16)
+
+        self.assertTrue(all(gate.is_active(silence) for _ in range(3)))
+        self.assertFalse(gate.is_active(silence))
+
+    def test_loud_frame_opens_gate_with_hangover(self):
+        """Test that speech opens the gate and it stays open for the hangover."""
+        gate = EnergyGate(warmup_frames=0, hangover_frames=2)
+        quiet = _tone(20)
+
+        self.assertFalse(gate.is_active(quiet))
+        self.assertTrue(gate.is_active(_tone(5000)))
+        self.assertTrue(gate.is_active(quiet))
+        self.assertTrue(gate.is_active(quiet))
+        self.assertFalse(gate.is_active(quiet))
+
+    def test_accepts_raw_pcm_bytes(self):
+        """Test that raw int16 PCM bytes are handled like arrays."""
+        gate = EnergyGate(warmup_frames=0)
+
+        self.assertTrue(gate.is_active(_tone(5000).tobytes()))
+
+
+class TestSpectralFlatness(unittest.TestCase):
+
+    def test_noise_is_flatter_than_tone(self):
+        """Test that white noise scores as noise-like and a tone does not."""
+        noise = np.random.default_rng(0).normal(0, 3000, 1024).astype(np.int16)
+
+        self.assertGreater(spectral_flatness(noise), 0.6)
+        self.assertLess(spectral_flatness(_tone(5000, length=1024)), 0.1)
+
+    def test_short_frame_not_flagged(self):
+        """Test that frames shorter than one FFT block are never treated as noise."""
+        self.assertEqual(spectral_flatness(np.ones(100, dtype=np.int16)), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
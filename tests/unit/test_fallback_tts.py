@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import Mock
+
+from home_assistant.speech.base_tts_provider import BaseTTSProvider, TTSConfigurationError
+from home_assistant.speech.fallback_tts import FallbackTTS
+
+
+def _mock_provider(name, speak_result=True):
+    provider = Mock(spec=BaseTTSProvider)
+    provider.config = {}
+    provider.get_provider_name.return_value = name
+    provider.speak.return_value = speak_result
+    return provider
+
+
+class TestFallbackTTS(unittest.TestCase):
+
+    def test_requires_provider(self):
+        """Test that an empty provider chain is rejected."""
+        with self.assertRaises(TTSConfigurationError):
+            FallbackTTS()
+
+    def test_primary_used_when_healthy(self):
+        """Test that the first provider handles speech when it succeeds."""
+        primary = _mock_provider('piper')
+        fallback = _mock_provider('pyttsx')
+        tts = FallbackTTS(primary, fallback)
+
+        self.assertTrue(tts.speak("hello"))
+        primary.speak.assert_called_once_with("hello")
+        fallback.speak.assert_not_called()
+
+    def test_falls_back_and_skips_dead_provider(self):
+        """Test that a failing provider is skipped until its cooldown expires."""
+        primary = _mock_provider('piper')
+        primary.speak.side_effect = RuntimeError("device busy")
+        fallback = _mock_provider('pyttsx')
+        tts = FallbackTTS(primary, fallback)
+
+        self.assertTrue(tts.speak("first"))
+        self.assertTrue(tts.speak("second"))
+
+        primary.speak.assert_called_once_with("first")
+        self.assertEqual(fallback.speak.call_count, 2)
+        self.assertEqual(tts.get_provider_name(), 'pyttsx')
+
+    def test_all_dead_providers_are_retried(self):
+        """Test that providers in cooldown are still tried when none are live."""
+        primary = _mock_provider('piper', speak_result=False)
+        tts = FallbackTTS(primary, cooldown=60.0)
+
+        self.assertFalse(tts.speak("first"))
+        self.assertFalse(tts.speak("second"))
+        self.assertEqual(primary.speak.call_count, 2)
+
+    def test_invalid_text_not_delegated(self):
+        """Test that invalid input is rejected without touching providers."""
+        primary = _mock_provider('piper')
+        tts = FallbackTTS(primary)
+
+        self.assertFalse(tts.speak("   "))
+        primary.speak.assert_not_called()
+
+    def test_rate_and_volume_reach_every_provider(self):
+        """Test that settings made during a fallback still apply when the primary recovers."""
+        primary = _mock_provider('piper')
+        primary.speak.side_effect = RuntimeError("device busy")
+        fallback = _mock_provider('pyttsx')
+        fallback.set_rate.return_value = True
+        fallback.set_volume.return_value = False
+        tts = FallbackTTS(primary, fallback)
+        tts.speak("first")
+
+        self.assertTrue(tts.set_rate(180))
+        self.assertFalse(tts.set_volume(0.8))
+
+        primary.set_rate.assert_called_once_with(180)
+        primary.set_volume.assert_called_once_with(0.8)
+        fallback.set_rate.assert_called_once_with(180)
+        fallback.set_volume.assert_called_once_with(0.8)
+
+    def test_voice_set_on_active_provider_only(self):
+        """Test that engine-specific voice ids only go to the active provider."""
+        primary = _mock_provider('piper')
+        fallback = _mock_provider('pyttsx')
+        tts = FallbackTTS(primary, fallback)
+
+        tts.set_voice('en_US-lessac-medium')
+
+        primary.set_voice.assert_called_once_with('en_US-lessac-medium')
+        fallback.set_voice.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
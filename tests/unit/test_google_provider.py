@@ -0,0 +1,87 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+try:
+    import speech_recognition as sr
+    from home_assistant.speech.providers.google_provider import GoogleSpeechProvider
+except ImportError:
+    sr = None
+
+
+@unittest.skipIf(sr is None, "SpeechRecognition is not installed")
+class TestSphinxFallback(unittest.TestCase):
+
+    def setUp(self):
+        with patch.object(GoogleSpeechProvider, '_initialize_provider'):
+            self.provider = GoogleSpeechProvider({'language': 'en-GB', 'sphinx_fallback': True,
+                                                  'sphinx_fallback_delay': 0.05})
+        self.provider.recognizer = Mock()
+        self.provider.recognizer.recognize_sphinx.return_value = "offline text"
+        self.audio = Mock()
+
+    def test_google_success_skips_sphinx(self):
+        """Test that a prompt Google result never starts an offline decode."""
+        self.provider.recognizer.recognize_google.return_value = "online text"
+
+        self.assertEqual(self.provider._recognize_with_sphinx_fallback(self.audio), "online text")
+        self.provider.recognizer.recognize_sphinx.assert_not_called()
+
+    def test_request_error_uses_sphinx_with_language(self):
+        """Test that a failed Google request is answered by Sphinx in the configured language."""
+        self.provider.recognizer.recognize_google.side_effect = sr.RequestError("offline")
+
+        self.assertEqual(self.provider._recognize_with_sphinx_fallback(self.audio), "offline text")
+        self.provider.recognizer.recognize_sphinx.assert_called_once_with(self.audio, language='en-GB')
+
+    def test_slow_request_error_uses_sphinx_started_early(self):
+        """Test that Sphinx starts while a slow Google request is outstanding and its result is used."""
+        release = threading.Event()
+
+        def slow_google(audio, **kwargs):
+            release.wait(1)
+            raise sr.RequestError("timed out")
+
+        def sphinx(audio, **kwargs):
+            release.set()
+            return "offline text"
+
+        self.provider.recognizer.recognize_google.side_effect = slow_google
+        self.provider.recognizer.recognize_sphinx.side_effect = sphinx
+
+        self.assertEqual(self.provider._recognize_with_sphinx_fallback(self.audio), "offline text")
+        self.provider.recognizer.recognize_sphinx.assert_called_once_with(self.audio, language='en-GB')
+
+    def test_late_google_success_cancels_queued_sphinx(self):
+        """Test that a Sphinx hedge still waiting for a worker is dropped once Google answers."""
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        # Keep one worker busy so the hedge has to queue
+        busy = threading.Event()
+        executor.submit(busy.wait, 5)
+        self.addCleanup(busy.set)
+
+        def slow_google(audio, **kwargs):
+            threading.Event().wait(0.2)
+            return "online text"
+
+        self.provider.recognizer.recognize_google.side_effect = slow_google
+
+        with patch('home_assistant.speech.providers.google_provider._get_executor', return_value=executor):
+            self.assertEqual(self.provider._recognize_with_sphinx_fallback(self.audio), "online text")
+        busy.set()
+        executor.shutdown(wait=True)
+        self.provider.recognizer.recognize_sphinx.assert_not_called()
+
+    def test_unknown_value_not_sent_to_sphinx(self):
+        """Test that audio Google heard but couldn't understand isn't decoded again."""
+        self.provider.recognizer.recognize_google.side_effect = sr.UnknownValueError()
+
+        with self.assertRaises(sr.UnknownValueError):
+            self.provider._recognize_with_sphinx_fallback(self.audio)
+        self.provider.recognizer.recognize_sphinx.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import time
+import unittest
+
+from home_assistant.utils.logger import get_recent_errors, setup_logging
+
+
+class TestRecentErrors(unittest.TestCase):
+
+    def _wait_for(self, message, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if any(message in record for record in get_recent_errors()):
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_errors_are_kept_in_memory(self):
+        """Test that ERROR records reach the recent-error buffer."""
+        logger = setup_logging("home_assistant.test.recent_errors")
+        logger.error("recent error marker %d", 42)
+
+        self.assertTrue(self._wait_for("recent error marker 42"))
+
+    def test_warnings_are_not_kept(self):
+        """Test that records below ERROR are not buffered."""
+        logger = setup_logging("home_assistant.test.recent_errors")
+        logger.warning("warning marker")
+        logger.error("error after warning marker")
+
+        self.assertTrue(self._wait_for("error after warning marker"))
+        self.assertFalse(any("warning marker" == record.rsplit(" - ", 1)[-1] for record in get_recent_errors()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import os
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import yaml
+
+from home_assistant.wake_word.providers.pocketsphinx_provider import PocketSphinxProvider
+
+
+class TestPocketSphinxKeyphrases(unittest.TestCase):
+
+    def test_aliases_follow_wake_word(self):
+        """Test that configured aliases are spotted after the requested wake word without duplicates."""
+        provider = PocketSphinxProvider({'wake_words': ['hello', 'hey computer']})
+
+        self.assertEqual(provider._keyphrases('hey computer'), ('hey computer', 'hello'))
+
+    def test_kws_file_lists_each_phrase(self):
+        """Test that the keyword list file has one thresholded line per phrase."""
+        provider = PocketSphinxProvider({'keyphrase_threshold': 1e-30})
+        path = provider._write_kws_file(('Hey Computer', 'hello'))
+        self.addCleanup(provider._remove_kws_file)
+
+        with open(path) as kws_file:
+            self.assertEqual(kws_file.read(), "hey computer /1e-30/\nhello /1e-30/\n")
+
+        provider._remove_kws_file()
+        self.assertFalse(os.path.exists(path))
+
+    def test_shipped_config_threshold(self):
+        """Test that the threshold from config.yaml, which YAML loads as a string, is usable."""
+        config_path = Path(__file__).resolve().parents[2] / 'config.yaml'
+        config = yaml.safe_load(config_path.read_text())['wake_word']['detection']['providers']['pocketsphinx']
+        provider = PocketSphinxProvider(config)
+        path = provider._write_kws_file(('hey computer', 'hello'))
+        self.addCleanup(provider._remove_kws_file)
+
+        self.assertEqual(provider.keyphrase_threshold, 1e-20)
+        with open(path) as kws_file:
+            self.assertEqual(kws_file.read(), "hey computer /1e-20/\nhello /1e-20/\n")
+
+
+class TestPocketSphinxThreshold(unittest.TestCase):
+
+    def test_auto_threshold_scales_with_syllables(self):
+        """Test that longer phrases get lower thresholds, clipped to the usable range."""
+        self.assertEqual(PocketSphinxProvider._auto_threshold('hey'), 1e-6)
+        self.assertEqual(PocketSphinxProvider._auto_threshold('hey computer'), 1e-18)
+        self.assertEqual(PocketSphinxProvider._auto_threshold('ok ' * 20), 1e-50)
+
+    def test_auto_threshold_used_when_requested(self):
+        """Test that keyphrase_threshold 'auto' picks a per-phrase threshold."""
+        provider = PocketSphinxProvider({'keyphrase_threshold': 'auto'})
+
+        self.assertEqual(provider._phrase_threshold('hey'), 1e-6)
+
+    def test_default_threshold(self):
+        """Test that a missing or null keyphrase_threshold keeps the fixed 1e-20 default."""
+        for config in ({}, {'keyphrase_threshold': None}):
+            provider = PocketSphinxProvider(config)
+
+            self.assertEqual(provider._phrase_threshold('hey'), 1e-20)
+
+    def test_numeric_string_threshold(self):
+        """Test that a numeric string threshold is parsed to a float."""
+        provider = PocketSphinxProvider({'keyphrase_threshold': '1e-15'})
+
+        self.assertEqual(provider._phrase_threshold('hey computer'), 1e-15)
+
+    def test_configured_threshold_wins(self):
+        """Test that an explicit keyphrase_threshold is used for every phrase."""
+        provider = PocketSphinxProvider({'keyphrase_threshold': 1e-5})
+
+        self.assertEqual(provider._phrase_threshold('hey computer'), 1e-5)
+
+
+class _FakeDecoder:
+    """Decoder whose hypothesis stays pending until the utterance is ended, like PocketSphinx's."""
+
+    def __init__(self, clock, hits):
+        self._clock = clock
+        self._hits = list(hits)
+        self._pending = None
+
+    def start_utt(self):
+        pass
+
+    def end_utt(self):
+        self._pending = None
+
+    def process_raw(self, data, no_search, full_utt):
+        self._clock['now'] += 0.5
+        if self._hits.pop(0):
+            self._pending = SimpleNamespace(hypstr='hey computer', best_score=-1000)
+        if not self._hits:
+            # Script exhausted; let the listen time out
+            self._clock['now'] += 100
+
+    def hyp(self):
+        return self._pending
+
+
+class TestRefractoryWindow(unittest.TestCase):
+
+    def _listen(self, provider, clock, hits):
+        provider.decoder = _FakeDecoder(clock, hits)
+        for _ in hits:
+            provider._audio_queue.put_nowait(b'\0' * 2048)
+        with patch.object(provider, '_initialize_pocketsphinx'), \
+             patch.object(provider, '_ensure_audio'), \
+             patch('home_assistant.wake_word.providers.pocketsphinx_provider.time.monotonic',
+                   side_effect=lambda: clock['now']):
+            return provider.listen_for_wake_word('hey computer', timeout=10)[0]
+
+    def test_suppressed_hits_do_not_fire_after_window(self):
+        """Test that repeats inside the window are discarded instead of firing once it ends."""
+        provider = PocketSphinxProvider({'refractory_seconds': 1.5})
+        clock = {'now': 0.0}
+
+        detections = [self._listen(provider, clock, [True])]
+        # Two repeats inside the window, then silence past its end
+        detections.append(self._listen(provider, clock, [True, True, False, False, False]))
+
+        self.assertEqual(detections, [True, False])
+
+
+@unittest.skipUnless(hasattr(os, 'sched_setaffinity'), "CPU affinity is Linux only")
+class TestDetectionScheduling(unittest.TestCase):
+
+    def test_affinity_applied_and_restored(self):
+        """Test that the detection loop pinning is undone afterwards."""
+        original = os.sched_getaffinity(0)
+        cpu = min(original)
+        provider = PocketSphinxProvider({'cpu_affinity': [cpu]})
+
+        previous = provider._apply_detection_scheduling()
+        self.assertEqual(os.sched_getaffinity(0), {cpu})
+
+        provider._restore_detection_scheduling(previous)
+        self.assertEqual(os.sched_getaffinity(0), original)
+
+    def test_nothing_changed_without_config(self):
+        """Test that scheduling is left alone unless configured."""
+        self.assertIsNone(PocketSphinxProvider({})._apply_detection_scheduling())
+
+
+if __name__ == '__main__':
+    unittest.main()
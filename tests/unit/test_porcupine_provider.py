@@ -0,0 +1,37 @@
+import unittest
+from unittest.mock import Mock
+
+from home_assistant.wake_word.base_wake_word_provider import WakeWordConfigurationError
+from home_assistant.wake_word.providers.porcupine_provider import PorcupineProvider
+
+
+class TestPorcupineKeywords(unittest.TestCase):
+
+    def test_builtin_keyword_resolved_case_insensitively(self):
+        """Test that built-in keywords are matched regardless of case."""
+        provider = PorcupineProvider({})
+
+        self.assertEqual(provider._resolve_keywords('Hey Siri'), (['hey siri'], []))
+
+    def test_unknown_keyword_rejected(self):
+        """Test that a wake word without a built-in model or keyword file is rejected."""
+        provider = PorcupineProvider({})
+
+        with self.assertRaises(WakeWordConfigurationError):
+            provider._resolve_keywords('hello there')
+
+    def test_same_keyword_reuses_instance(self):
+        """Test that the Porcupine instance is kept while the keyword is unchanged."""
+        provider = PorcupineProvider({})
+        porcupine = Mock()
+        provider.porcupine = porcupine
+        provider._current_keywords = ('alexa',)
+
+        provider._initialize_porcupine('Alexa')
+
+        porcupine.delete.assert_not_called()
+        self.assertIs(provider.porcupine, porcupine)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+
+from home_assistant.speech import base_speech_provider
+from home_assistant.speech.base_speech_provider import BaseSpeechProvider
+
+
+class _DummyProvider(BaseSpeechProvider):
+    def _validate_config(self):
+        pass
+
+    def _initialize_provider(self):
+        pass
+
+    def listen_for_speech(self, timeout=10, phrase_timeout=5):
+        return False, None
+
+    def is_available(self):
+        return True
+
+    def get_engine_info(self):
+        return {}
+
+
+class TestAmbientNoiseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.temp_dir, 'cache', 'noise.json')
+        patcher = patch.object(base_speech_provider, 'NOISE_CACHE_PATH', self.cache_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _recognizer(self, measured=420.0):
+        recognizer = Mock()
+        recognizer.energy_threshold = 300
+
+        def adjust(source, duration=1):
+            recognizer.energy_threshold = measured
+
+        recognizer.adjust_for_ambient_noise.side_effect = adjust
+        return recognizer
+
+    def test_measures_and_persists_threshold(self):
+        """Test that the first calibration samples noise and writes the cache."""
+        provider = _DummyProvider({})
+        recognizer = self._recognizer()
+
+        provider._calibrate_ambient_noise(recognizer, MagicMock())
+
+        recognizer.adjust_for_ambient_noise.assert_called_once()
+        with open(self.cache_path) as f:
+            self.assertEqual(json.load(f)['_dummyprovider']['energy_threshold'], 420.0)
+
+    def test_reuses_fresh_threshold(self):
+        """Test that a fresh cached threshold skips the microphone."""
+        _DummyProvider({})._calibrate_ambient_noise(self._recognizer(), MagicMock())
+
+        recognizer = self._recognizer(measured=999.0)
+        _DummyProvider({})._calibrate_ambient_noise(recognizer, MagicMock())
+
+        recognizer.adjust_for_ambient_noise.assert_not_called()
+        self.assertEqual(recognizer.energy_threshold, 420.0)
+
+    def test_stale_or_recalibrate_measures_again(self):
+        """Test that an expired entry or the recalibrate option re-samples noise."""
+        _DummyProvider({})._calibrate_ambient_noise(self._recognizer(), MagicMock())
+
+        with patch.object(base_speech_provider.time, 'time', return_value=time.time() + 7200):
+            recognizer = self._recognizer(measured=500.0)
+            _DummyProvider({})._calibrate_ambient_noise(recognizer, MagicMock())
+        recognizer.adjust_for_ambient_noise.assert_called_once()
+
+        recognizer = self._recognizer(measured=600.0)
+        _DummyProvider({'recalibrate': True})._calibrate_ambient_noise(recognizer, MagicMock())
+        recognizer.adjust_for_ambient_noise.assert_called_once()
+        self.assertEqual(recognizer.energy_threshold, 600.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
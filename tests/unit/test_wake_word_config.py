@@ -10,6 +10,7 @@ import os
 import unittest
 import tempfile
 import yaml
+from collections.abc import Mapping
 
 # Add project root to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
@@ -82,7 +83,7 @@ class WakeWordConfigTests(unittest.TestCase):
         
         detection_config = config_manager.get_wake_word_detection_config()
         
-        self.assertIsInstance(detection_config, dict)
+        self.assertIsInstance(detection_config, Mapping)
         self.assertIn('provider', detection_config)
         self.assertIn('providers', detection_config)
 
@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from home_assistant.wake_word import detector as detector_module
+from home_assistant.wake_word.base_wake_word_provider import WakeWordConfigurationError
+from home_assistant.wake_word.detector import WakeWordDetector
+
+
+class TestWakeWordDetectorRegistry(unittest.TestCase):
+
+    def setUp(self):
+        config_patcher = patch.object(detector_module, 'ConfigManager')
+        self.config_manager = config_patcher.start().return_value
+        self.config_manager.get_config.return_value = {}
+        self.addCleanup(config_patcher.stop)
+
+        cache_patcher = patch.dict(detector_module._PROVIDER_CLASS_CACHE, clear=True)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    def test_unknown_provider_rejected(self):
+        """Test that an unregistered provider name raises a configuration error."""
+        with self.assertRaises(WakeWordConfigurationError):
+            WakeWordDetector('does-not-exist')
+
+    def test_provider_class_loaded_once(self):
+        """Test that the provider module loader only runs on first use."""
+        provider_class = Mock()
+        loader = Mock(return_value=provider_class)
+
+        with patch.dict(detector_module._PROVIDER_REGISTRY, {'fake': loader}):
+            WakeWordDetector('fake')
+            WakeWordDetector('fake')
+
+        loader.assert_called_once_with()
+        self.assertEqual(provider_class.call_count, 2)
+        provider_class.assert_called_with({'provider_name': 'fake'})
+
+
+class TestAvailabilityCache(unittest.TestCase):
+
+    def setUp(self):
+        config_patcher = patch.object(detector_module, 'ConfigManager')
+        self.config_manager = config_patcher.start().return_value
+        self.config_manager.get_config.return_value = {}
+        self.config_manager.config_path = '/nonexistent/config.yaml'
+        self.addCleanup(config_patcher.stop)
+
+        self.provider_class = Mock()
+        for patcher in (patch.dict(detector_module._PROVIDER_CLASS_CACHE, clear=True),
+                        patch.dict(detector_module._PROVIDER_REGISTRY, {'fake': Mock(return_value=self.provider_class)}, clear=True),
+                        patch.dict(WakeWordDetector._availability_cache, clear=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_unavailable_provider_rechecked_after_ttl(self):
+        """Test that a cached result is reused briefly but re-probed once it expires."""
+        self.provider_class.return_value.is_available.side_effect = [False, True]
+        detector = WakeWordDetector('fake')
+
+        with patch.object(detector_module.time, 'monotonic', return_value=100.0):
+            self.assertEqual(detector.get_available_providers(), {'fake': False})
+        with patch.object(detector_module.time, 'monotonic', return_value=110.0):
+            self.assertEqual(detector.get_available_providers(), {'fake': False})
+        with patch.object(detector_module.time, 'monotonic', return_value=100.0 + detector_module._AVAILABILITY_TTL):
+            self.assertEqual(detector.get_available_providers(), {'fake': True})
+
+        self.assertEqual(list(WakeWordDetector._availability_cache), ['fake'])
+
+
+if __name__ == '__main__':
+    unittest.main()